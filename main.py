@@ -4,39 +4,86 @@ __version__ = "1.2.0"
 import os
 import sys
 import json
+import time
+STARTUP_TIME = time.perf_counter()  # for time-to-interactive (see STARTUP_BUDGET_MS)
+import shutil
+import hashlib
 import threading
+import contextlib
 import platform
+import multiprocessing
+from collections import OrderedDict
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QLabel, QPushButton, QLineEdit, QComboBox, QCheckBox, QRadioButton,
     QFileDialog, QSlider, QProgressBar, QScrollArea, QFrame, QMenu, 
     QMessageBox, QGroupBox, QSpinBox, QTabWidget, QSplashScreen, QDialog,
-    QGridLayout
+    QGridLayout, QDoubleSpinBox
 )
-from PyQt6.QtGui import QPixmap, QImage, QIcon, QColor, QPalette, QAction, QPainter, QPen, QBrush
-from PyQt6.QtCore import Qt, QThread, pyqtSignal, QSize, QPoint, QTimer
-from PIL import Image
-import cv2
-from PIL import Image
-import numpy as np
-import requests
-from packaging import version
+from PyQt6.QtGui import QPixmap, QImage, QIcon, QColor, QPalette, QAction, QPainter, QPen, QBrush, QKeySequence
+from PyQt6.QtCore import Qt, QThread, QObject, pyqtSignal, QSize, QPoint, QRect, QTimer
 from urllib.parse import urlparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import importlib
+import importlib.util
 
 
+class LazyModule:
+    """
+    Stand-in for a heavy module that imports it on first attribute access
+    and then replaces itself in this module's globals, so the window can
+    appear before OpenCV, NumPy, PIL or requests are loaded.
+    """
+
+    def __init__(self, name, alias, on_load=None):
+        self._name = name
+        self._alias = alias
+        self._on_load = on_load
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            module = importlib.import_module(self._name)
+            if self._on_load:
+                self._on_load(module)
+            globals()[self._alias] = self._module = module
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+
+# Add moviepy for video conversion (imported when a video is converted)
+MOVIEPY_AVAILABLE = importlib.util.find_spec("moviepy") is not None
+
+# Add pillow-heif so Image.open can decode HEIC/HEIF (iPhone photos)
+HEIF_AVAILABLE = importlib.util.find_spec("pillow_heif") is not None
 
-# Add moviepy for video conversion
-try:
-    from moviepy import VideoFileClip
-    MOVIEPY_AVAILABLE = True
-except ImportError:
-    MOVIEPY_AVAILABLE = False
+
+def register_image_plugins(image_module):
+    """ Called when PIL is first loaded """
+    if HEIF_AVAILABLE:
+        pillow_heif.register_heif_opener()
+
+
+Image = LazyModule("PIL.Image", "Image", on_load=register_image_plugins)
+pillow_heif = LazyModule("pillow_heif", "pillow_heif")
+cv2 = LazyModule("cv2", "cv2")
+np = LazyModule("numpy", "np")
+requests = LazyModule("requests", "requests")
+version = LazyModule("packaging.version", "version")
 
 
 # List of supported formats
 SUPPORTED_FORMATS = ['jpg', 'jpeg', 'png', 'bmp', 'tiff', 'webp', 'heic']
 SUPPORTED_VIDEO_FORMATS = ['mp4', 'avi', 'mov', 'mkv', 'webm']
 
+# Time-to-interactive budget: process start until the main window has been
+# painted and the event loop is running (override with EDITARA_STARTUP_BUDGET_MS)
+STARTUP_BUDGET_MS = 1500
+# Background model loading starts this long after the window appears
+STARTUP_WARM_UP_DELAY_MS = 500
+
 # Theme color schemes
 LIGHT_THEME = {
     "bg": "#f5f5f5",
@@ -64,7 +111,2196 @@ def resource_path(relative_path):
     """ Get absolute path to resource, works for dev and for PyInstaller """
     if hasattr(sys, '_MEIPASS'):
         return os.path.join(sys._MEIPASS, relative_path)
-    return os.path.join(os.path.abspath("."), relative_path)
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), relative_path)
+
+
+# Encoder profiles per output format (speed vs size).
+# "fast" favours encode time, "small" favours output size.
+ENCODER_PROFILE_NAMES = ["fast", "balanced", "small"]
+DEFAULT_ENCODER_PROFILE = "balanced"
+ENCODER_PROFILES = {
+    "jpg": {
+        "fast": {"optimize": False, "progressive": False, "subsampling": 2},
+        "balanced": {"optimize": True, "progressive": False, "subsampling": 2},
+        "small": {"optimize": True, "progressive": True, "subsampling": 2},
+    },
+    "webp": {
+        "fast": {"method": 0},
+        "balanced": {"method": 4},
+        "small": {"method": 6},
+    },
+    "png": {
+        "fast": {"compress_level": 1},
+        "balanced": {"compress_level": 6},
+        "small": {"compress_level": 9, "optimize": True},
+    },
+    "tiff": {
+        "fast": {"compression": "raw"},
+        "balanced": {"compression": "tiff_lzw"},
+        "small": {"compression": "tiff_adobe_deflate"},
+    },
+}
+
+
+def normalize_format(target_format):
+    """ Map format aliases (jpeg/jpg) to the key used in ENCODER_PROFILES """
+    fmt = target_format.lower().lstrip(".")
+    return "jpg" if fmt == "jpeg" else fmt
+
+
+def pil_format_name(target_format):
+    """ Pillow format name for an output format (used when saving to a buffer) """
+    fmt = normalize_format(target_format)
+    return {"jpg": "JPEG", "heic": "HEIF"}.get(fmt, fmt.upper())
+
+
+def get_save_args(target_format, quality, profile=DEFAULT_ENCODER_PROFILE):
+    """ Build Image.save() keyword arguments for a format and encoder profile """
+    fmt = normalize_format(target_format)
+    profiles = ENCODER_PROFILES.get(fmt, {})
+    save_args = dict(profiles.get(profile, profiles.get(DEFAULT_ENCODER_PROFILE, {})))
+    if fmt in ["jpg", "webp"] and quality is not None:
+        save_args["quality"] = quality
+    return save_args
+
+
+def load_heif_preview(file_path, max_size):
+    """
+    Return the HEIC/HEIF container's embedded preview if it covers max_size,
+    otherwise None. Avoids decoding the full tile grid for thumbnails.
+    """
+    if not HEIF_AVAILABLE:
+        return None
+    heif_file = pillow_heif.open_heif(file_path)
+    primary = heif_file[heif_file.primary_index]
+    boxes = primary.info.get("thumbnails", [])
+    wanted = max(max_size)
+    candidates = [(box, index) for index, box in enumerate(boxes) if box >= wanted]
+    if not candidates:
+        return None
+    _, index = min(candidates)
+    return primary.get_thumbnail(index).to_pillow()
+
+
+# EXIF orientation tag value -> Image.Transpose member that displays the image upright
+EXIF_ORIENTATION_TRANSPOSE = {
+    2: "FLIP_LEFT_RIGHT",
+    3: "ROTATE_180",
+    4: "FLIP_TOP_BOTTOM",
+    5: "TRANSPOSE",
+    6: "ROTATE_270",
+    7: "TRANSVERSE",
+    8: "ROTATE_90",
+}
+
+
+def load_exif_thumbnail(img, max_size):
+    """
+    Return the JPEG's embedded EXIF thumbnail (IFD1) if it covers max_size and
+    has the same aspect ratio as the full image, otherwise None.
+    """
+    from PIL import ExifTags
+    import io
+
+    raw = img.info.get("exif")
+    if not raw or not raw.startswith(b"Exif\x00\x00"):
+        return None
+    ifd1 = img.getexif().get_ifd(ExifTags.IFD.IFD1)
+    offset = ifd1.get(0x0201)  # JPEGInterchangeFormat
+    length = ifd1.get(0x0202)  # JPEGInterchangeFormatLength
+    if not offset or not length:
+        return None
+
+    # Offsets are relative to the TIFF header, which follows "Exif\0\0"
+    thumb = Image.open(io.BytesIO(raw[6 + offset:6 + offset + length]))
+    thumb.load()
+
+    # Skip letterboxed or too-small thumbnails
+    if thumb.width < max_size[0] and thumb.height < max_size[1]:
+        return None
+    if abs(thumb.width / thumb.height - img.width / img.height) > 0.02:
+        return None
+    return thumb
+
+
+def load_preview_image(file_path, max_size):
+    """
+    Load a small, upright preview of an image file, using embedded previews
+    where the format has them. The result fits inside max_size.
+    """
+    ext = os.path.splitext(file_path)[1].lower().lstrip('.')
+    if ext in ["heic", "heif"]:
+        try:
+            img = load_heif_preview(file_path, max_size)
+        except Exception:
+            img = None
+        if img is not None:
+            img.thumbnail(max_size)
+            return img
+
+    img = Image.open(file_path)
+    orientation = img.getexif().get(0x0112, 1)  # Orientation
+    if img.format == "JPEG":
+        try:
+            thumb = load_exif_thumbnail(img, max_size)
+        except Exception:
+            thumb = None
+        if thumb is not None:
+            img = thumb
+    # thumbnail() uses draft() so JPEGs without an EXIF thumbnail still get a reduced-size decode
+    img.thumbnail(max_size)
+    if orientation in EXIF_ORIENTATION_TRANSPOSE:
+        img = img.transpose(Image.Transpose[EXIF_ORIENTATION_TRANSPOSE[orientation]])
+    return img
+
+
+def compute_resize_dims(size, resize):
+    """ Return the new (width, height) for a resize setting ("width"|"height"|"both", w, h) """
+    original_w, original_h = size
+    mode, width, height = resize
+    if mode == "width":
+        return width, max(1, int(original_h * (width / original_w)))
+    if mode == "height":
+        return max(1, int(original_w * (height / original_h))), height
+    return width, height
+
+
+def get_output_folder(files, target_format):
+    """ Output folder next to the first input: Converted_to_<format> """
+    if os.path.isdir(files[0]):
+        return os.path.join(files[0], f"Converted_to_{target_format}")
+    return os.path.join(os.path.dirname(files[0]), f"Converted_to_{target_format}")
+
+
+def prepare_image_for_save(img, target_format, resize=None):
+    """ Apply the optional resize and any mode conversion the target format needs """
+    if resize:
+        img = img.resize(compute_resize_dims(img.size, resize), Image.LANCZOS)
+    if img.mode in ("RGBA", "LA", "P") and normalize_format(target_format) == "jpg":
+        img = img.convert("RGB")
+    return img
+
+
+# Formats where a target SSIM picks the quality setting
+TARGET_QUALITY_FORMATS = ["jpg", "webp"]
+
+
+def compute_ssim(reference, test):
+    """ Mean SSIM of two grayscale float arrays (Gaussian window, as in Wang et al.) """
+    c1 = (0.01 * 255) ** 2
+    c2 = (0.03 * 255) ** 2
+    blur = lambda a: cv2.GaussianBlur(a, (11, 11), 1.5)
+
+    mu_x = blur(reference)
+    mu_y = blur(test)
+    sigma_x = blur(reference * reference) - mu_x * mu_x
+    sigma_y = blur(test * test) - mu_y * mu_y
+    sigma_xy = blur(reference * test) - mu_x * mu_y
+
+    ssim_map = ((2 * mu_x * mu_y + c1) * (2 * sigma_xy + c2)) / \
+               ((mu_x * mu_x + mu_y * mu_y + c1) * (sigma_x + sigma_y + c2))
+    return float(ssim_map.mean())
+
+
+def sample_tiles(img, tile=256, count=8):
+    """
+    Build a small mosaic (one row) of full-resolution tiles for quality
+    search. Tiles are spread across the range of detail in the image and
+    aligned to the 16px codec block grid. Small images are returned whole.
+    """
+    cols, rows = img.width // tile, img.height // tile
+    if cols * rows <= count:
+        return img
+
+    # Estimate detail per cell on a 4x subsampled copy (nearest keeps the noise/edges)
+    step = 4
+    small = img.resize((img.width // step, img.height // step), Image.NEAREST).convert("L")
+    gray = np.asarray(small, dtype=np.float32)
+    size = tile // step
+    cells = gray[:rows * size, :cols * size].reshape(rows, size, cols, size)
+    detail = cells.std(axis=(1, 3)).ravel()
+    order = np.argsort(detail)
+    picks = [int(order[round(i * (len(order) - 1) / (count - 1))]) for i in range(count)]
+
+    mosaic = Image.new(img.mode, (tile * count, tile))
+    for i, cell in enumerate(picks):
+        x, y = (cell % cols) * tile, (cell // cols) * tile
+        mosaic.paste(img.crop((x, y, x + tile, y + tile)), (i * tile, 0))
+    return mosaic
+
+
+def find_quality_for_target(img, target_format, target_ssim, profile=DEFAULT_ENCODER_PROFILE,
+                            low=10, high=100):
+    """
+    Binary-search the lowest quality whose encode of a tile sample reaches
+    target_ssim in every tile. Scoring the worst tile rather than the
+    mosaic mean keeps the pick from missing the target on the full image.
+    """
+    import io
+
+    fmt = normalize_format(target_format)
+    pil_format = pil_format_name(fmt)
+    sample = sample_tiles(img)
+    reference = np.asarray(sample.convert("L"), dtype=np.float32)
+    tile = sample.height if sample is not img else sample.width  # mosaic tiles are square
+
+    def score(quality):
+        buffer = io.BytesIO()
+        sample.save(buffer, format=pil_format, **get_save_args(fmt, quality, profile))
+        buffer.seek(0)
+        with Image.open(buffer) as trial:
+            test = np.asarray(trial.convert("L"), dtype=np.float32)
+        return min(compute_ssim(reference[:, x:x + tile], test[:, x:x + tile])
+                   for x in range(0, reference.shape[1], tile))
+
+    best = high
+    while low <= high:
+        mid = (low + high) // 2
+        if score(mid) >= target_ssim:
+            best = mid
+            high = mid - 1
+        else:
+            low = mid + 1
+    return best
+
+
+def convert_image_file(file_path, target_path, target_format, quality,
+                       resize=None, profile=DEFAULT_ENCODER_PROFILE, target_ssim=None,
+                       operations=None):
+    """
+    Convert a single image file and write it to target_path.
+    operations is an optional ImagePipeline operation list run before the
+    resize. With target_ssim, the quality is searched per image (lossy
+    formats only).
+    """
+    pipeline = ImagePipeline(operations)
+    if resize:
+        pipeline = pipeline.then("resize", resize=resize)
+    with Image.open(file_path) as img:
+        img = prepare_image_for_save(pipeline.run(img), target_format)
+        if target_ssim and normalize_format(target_format) in TARGET_QUALITY_FORMATS:
+            quality = find_quality_for_target(img, target_format, target_ssim, profile)
+        img.save(target_path, **get_save_args(target_format, quality, profile))
+
+
+def format_bytes(size):
+    """ Human readable byte count """
+    for unit in ["B", "KB", "MB", "GB"]:
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+def hash_file(file_path, chunk_size=1024 * 1024):
+    """ Streaming content hash of a file """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def find_duplicate_files(files):
+    """
+    Map each file whose content repeats an earlier file in the list to that
+    earlier file. Only files that share a size are hashed.
+    """
+    by_size = {}
+    for path in files:
+        try:
+            by_size.setdefault(os.path.getsize(path), []).append(path)
+        except OSError:
+            continue
+
+    duplicates = {}
+    for paths in by_size.values():
+        if len(paths) < 2:
+            continue
+        first_by_hash = {}
+        for path in paths:
+            try:
+                digest = hash_file(path)
+            except OSError:
+                continue
+            if digest in first_by_hash:
+                duplicates[path] = first_by_hash[digest]
+            else:
+                first_by_hash[digest] = path
+    return duplicates
+
+
+def link_or_copy(src, dst):
+    """ Hardlink dst to src, falling back to a copy (e.g. across drives) """
+    if os.path.exists(dst):
+        os.remove(dst)
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+# Append-only job journal kept in the output folder so a batch can resume
+JOB_JOURNAL_NAME = "editara_job.jsonl"
+
+
+class JobJournal:
+    """
+    Append-only record of a conversion job: a header line with the job
+    settings, then one line per finished file, then a "finished" line.
+    Lines are flushed as they are written (enough to survive an app crash);
+    fsync runs at most once per sync_interval seconds so small-file batches
+    are not slowed down. After a power loss at most that many seconds of
+    files are converted again.
+    """
+
+    def __init__(self, path, sync_interval=1.0):
+        self.path = path
+        self.sync_interval = sync_interval
+        self.last_sync = time.monotonic()
+        self.file = None
+
+    @staticmethod
+    def load(path):
+        """ Return (settings, entries by file path, finished) from a journal file """
+        settings = None
+        entries = {}
+        finished = False
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # torn line from a crash
+                if "job" in record:
+                    settings = record["job"]
+                elif "file" in record:
+                    entries[record["file"]] = record
+                elif record.get("finished"):
+                    finished = True
+        return settings, entries, finished
+
+    def start(self, settings, resume=False):
+        if resume:
+            self.trim_torn_line()
+            self.file = open(self.path, "a", encoding="utf-8")
+        else:
+            self.file = open(self.path, "w", encoding="utf-8")
+            self.write({"job": settings})
+
+    def trim_torn_line(self):
+        """ Cut a partial last line left by a crash, so appended records start on a line of their own """
+        with open(self.path, "rb+") as f:
+            end = f.seek(0, os.SEEK_END)
+            keep = end
+            while keep > 0:
+                start = max(0, keep - 4096)
+                f.seek(start)
+                newline = f.read(keep - start).rfind(b"\n")
+                if newline >= 0:
+                    keep = start + newline + 1
+                    break
+                keep = start
+            if keep < end:
+                f.truncate(keep)
+
+    def write(self, record):
+        self.file.write(json.dumps(record) + "\n")
+        self.file.flush()
+        now = time.monotonic()
+        if now - self.last_sync >= self.sync_interval:
+            os.fsync(self.file.fileno())
+            self.last_sync = now
+
+    def record(self, file_path, status, target=None, seconds=0.0, bytes_saved=0, error=None):
+        record = {
+            "file": file_path,
+            "status": status,
+            "target": target,
+            "seconds": round(seconds, 4),
+            "bytes_saved": bytes_saved,
+        }
+        if error:
+            record["error"] = error
+        self.write(record)
+
+    def finish(self):
+        self.write({"finished": True})
+
+    def close(self):
+        if self.file:
+            os.fsync(self.file.fileno())
+            self.file.close()
+            self.file = None
+
+
+def find_job_journal(path):
+    """ Accept a journal file or the output folder that contains one """
+    if os.path.isdir(path):
+        path = os.path.join(path, JOB_JOURNAL_NAME)
+    return path if os.path.isfile(path) else None
+
+
+def find_resumable_job(files, target_format):
+    """ Return the journal path of an unfinished job with the same files and format, if any """
+    journal_path = find_job_journal(get_output_folder(files, target_format))
+    if not journal_path:
+        return None
+    try:
+        settings, entries, finished = JobJournal.load(journal_path)
+    except OSError:
+        return None
+    if finished or not settings:
+        return None
+    if settings.get("files") != list(files) or settings.get("target_format") != target_format:
+        return None
+    return journal_path
+
+
+BATCH_REPORT_NAME = "editara_report.csv"
+
+
+def convert_image_task(file_path, target_path, *args):
+    """ convert_image_file for a worker process; returns the seconds it took """
+    start = time.perf_counter()
+    convert_image_file(file_path, target_path, *args)
+    return time.perf_counter() - start
+
+
+def init_conversion_worker(mask_folder):
+    """ Pool worker setup: spawned workers re-import this module, so carry the parent's settings over """
+    mask_cache.folder = mask_folder
+
+
+def run_conversion_tasks(tasks, conversion_args, workers=1, batch_masks=False):
+    """
+    Convert (file_path, target_path) tasks, on a process pool when workers > 1.
+    Yields (file_path, target_path, seconds, error) as each one finishes.
+    With batch_masks (pipelines starting with a DNN remove_background), the
+    sequential path segments SEGMENTATION_BATCH_SIZE files per model run
+    before converting them.
+    """
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    if workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks)), initializer=init_conversion_worker,
+                                 initargs=(mask_cache.folder,)) as pool:
+            futures = {
+                pool.submit(convert_image_task, file_path, target_path, *conversion_args): (file_path, target_path)
+                for file_path, target_path in tasks
+            }
+            for future in as_completed(futures):
+                file_path, target_path = futures[future]
+                try:
+                    yield file_path, target_path, future.result(), None
+                except Exception as e:
+                    yield file_path, target_path, 0.0, str(e) or type(e).__name__
+    else:
+        step = SEGMENTATION_BATCH_SIZE if batch_masks else max(1, len(tasks))
+        for start in range(0, len(tasks), step):
+            chunk = tasks[start:start + step]
+            if batch_masks:
+                try:
+                    prefetch_foreground_masks([file_path for file_path, _ in chunk])
+                except Exception:
+                    pass  # each file then segments, and reports errors, on its own
+            for file_path, target_path in chunk:
+                try:
+                    yield file_path, target_path, convert_image_task(file_path, target_path, *conversion_args), None
+                except Exception as e:
+                    yield file_path, target_path, 0.0, str(e) or type(e).__name__
+
+
+def write_batch_report(path, files, results):
+    """ One CSV row per file: file, status, output, seconds, error """
+    import csv
+
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["file", "status", "output", "seconds", "error"])
+        for file_path in files:
+            status, target, seconds, error = results.get(file_path, ("pending", None, 0.0, None))
+            writer.writerow([file_path, status, target or "", f"{seconds:.3f}", error or ""])
+
+
+def convert_image_batch(files, target_format, quality, resize=None,
+                        profile=DEFAULT_ENCODER_PROFILE, progress=None, dedup=True,
+                        target_ssim=None, resume=False, operations=None, workers=1):
+    """
+    Convert a list of image files into Converted_to_<format>.
+    With dedup, files with identical content are converted once and the
+    output is linked for the copies. With target_ssim, each image gets the
+    lowest quality that meets the target instead of the fixed quality.
+    operations (an ImagePipeline operation list) run on each image first.
+    With workers > 1 the files are converted on a process pool.
+    Every finished file is recorded in the job journal; with resume, files
+    already in the journal are not processed again. A per-file report is
+    written to editara_report.csv in the output folder.
+    Returns a summary dict (converted, skipped, failed, duplicates,
+    bytes_saved, time_saved, output_folder, report).
+    """
+    target_ext = f".{target_format.lower()}"
+    output_folder = get_output_folder(files, target_format)
+    os.makedirs(output_folder, exist_ok=True)
+
+    summary = {
+        "converted": 0,
+        "skipped": 0,
+        "failed": 0,
+        "duplicates": 0,
+        "bytes_saved": 0,
+        "time_saved": 0.0,
+        "output_folder": output_folder,
+        "report": os.path.join(output_folder, BATCH_REPORT_NAME),
+    }
+    total_files = len(files)
+
+    # Job journal (settings header + one line per finished file)
+    journal = JobJournal(os.path.join(output_folder, JOB_JOURNAL_NAME))
+    settings = {
+        "files": list(files),
+        "target_format": target_format,
+        "quality": quality,
+        "resize": resize,
+        "profile": profile,
+        "dedup": dedup,
+        "target_ssim": target_ssim,
+        "operations": operations,
+    }
+    done = {}
+    if resume and os.path.isfile(journal.path):
+        _, done, _ = JobJournal.load(journal.path)
+    journal.start(settings, resume=bool(done))
+
+    # Group identical inputs so each unique file is decoded/encoded once
+    duplicates = find_duplicate_files(files) if dedup else {}
+    outputs = {}  # source path -> (target path, seconds spent converting)
+    results = {}  # file path -> (status, target, seconds, error), for the report
+
+    def finish(file_path, status, target=None, seconds=0.0, bytes_saved=0, error=None):
+        if status in ["converted", "duplicate"]:
+            summary["converted"] += 1
+        else:
+            summary["skipped"] += 1
+        if status == "failed":
+            summary["failed"] += 1
+            print(f"Error converting {file_path}: {error}")
+        if status == "converted":
+            outputs[file_path] = (target, seconds)
+        elif status == "duplicate":
+            summary["duplicates"] += 1
+            summary["bytes_saved"] += bytes_saved
+            summary["time_saved"] += seconds
+        results[file_path] = (status, target, seconds, error)
+        if file_path not in done:
+            journal.record(file_path, status, target, seconds, bytes_saved, error)
+            if progress:
+                progress(int((len(results) / total_files) * 100))
+
+    def link_duplicate(file_path, target_path, source):
+        source_target, seconds = outputs[source]
+        if source_target != target_path:
+            link_or_copy(source_target, target_path)
+        finish(file_path, "duplicate", target_path, seconds, os.path.getsize(file_path))
+
+    # Restore results and converted outputs from the previous run
+    for entry in done.values():
+        finish(entry["file"], entry["status"], entry["target"], entry["seconds"],
+               entry["bytes_saved"], entry.get("error"))
+
+    try:
+        # Plan: skip, link to an earlier identical output, or convert
+        tasks = []
+        waiting = []  # duplicates of files that are converted in this run
+        for file_path in files:
+            if file_path in done:
+                continue
+            base_name, ext = os.path.splitext(os.path.basename(file_path))
+
+            # Skip if same format (unless there are edits to apply)
+            if ext.lower() == target_ext and not operations:
+                finish(file_path, "skipped")
+                continue
+
+            target_path = os.path.join(output_folder, f"{base_name}{target_ext}")
+            source = duplicates.get(file_path)
+            if source in outputs:
+                link_duplicate(file_path, target_path, source)
+            elif source is not None and any(task[0] == source for task in tasks):
+                waiting.append((file_path, target_path, source))
+            else:
+                tasks.append((file_path, target_path))
+
+        conversion_args = (target_format, quality, resize, profile, target_ssim, operations)
+        batch_masks = bool(operations) and operations[0]["op"] == "remove_background" and \
+            uses_segmentation_model(operations[0].get("engine", DEFAULT_SEGMENTATION_ENGINE))
+        for file_path, target_path, seconds, error in run_conversion_tasks(tasks, conversion_args, workers, batch_masks):
+            if error is None:
+                finish(file_path, "converted", target_path, seconds)
+            else:
+                finish(file_path, "failed", error=error)
+
+        # Link the copies; convert them after all if their source failed
+        retry = []
+        for file_path, target_path, source in waiting:
+            if source in outputs:
+                link_duplicate(file_path, target_path, source)
+            else:
+                retry.append((file_path, target_path))
+        for file_path, target_path, seconds, error in run_conversion_tasks(retry, conversion_args):
+            if error is None:
+                finish(file_path, "converted", target_path, seconds)
+            else:
+                finish(file_path, "failed", error=error)
+
+        journal.finish()
+    finally:
+        journal.close()
+        try:
+            write_batch_report(summary["report"], files, results)
+        except OSError:
+            summary["report"] = None
+
+    return summary
+
+
+def resume_image_job(journal_path, progress=None):
+    """ Resume the conversion job recorded in a journal file with its original settings """
+    settings, _, _ = JobJournal.load(journal_path)
+    if not settings:
+        raise ValueError(f"Not an Editara job journal: {journal_path}")
+    settings = dict(settings)
+    files = settings.pop("files")
+    target_format = settings.pop("target_format")
+    quality = settings.pop("quality")
+    return convert_image_batch(files, target_format, quality, progress=progress, resume=True, **settings)
+
+
+# Passport photo size in pixels (35x45 mm at 300 DPI)
+PASSPORT_SIZE = (413, 531)
+
+
+class PipelineBuffer:
+    """
+    The image moving through an ImagePipeline. It is held either as a PIL
+    image or as a NumPy array and only converted when an operation needs the
+    other form. Arrays remember their channel order (RGB or BGR) so OpenCV
+    steps don't swap channels back and forth.
+    """
+
+    def __init__(self, image):
+        self.image = image
+        self.array = None
+        self.order = None
+
+    @property
+    def size(self):
+        if self.image is not None:
+            return self.image.size
+        return self.array.shape[1], self.array.shape[0]
+
+    def as_array(self, order=None):
+        if self.array is None:
+            img = self.image
+            if img.mode not in ("RGB", "RGBA"):
+                has_alpha = "A" in img.getbands() or "transparency" in img.info
+                img = img.convert("RGBA" if has_alpha else "RGB")
+            self.array = np.asarray(img)
+            self.order = "RGB"
+            self.image = None
+        if order and order != self.order:
+            # RGB<->BGR is the same swap in both directions
+            code = cv2.COLOR_RGBA2BGRA if self.array.shape[2] == 4 else cv2.COLOR_RGB2BGR
+            self.array = cv2.cvtColor(self.array, code)
+            self.order = order
+        return self.array
+
+    def as_image(self):
+        if self.image is None:
+            self.image = Image.fromarray(self.as_array("RGB"))
+            self.array = None
+        return self.image
+
+    def set_array(self, array, order):
+        self.array = array
+        self.order = order
+        self.image = None
+
+    def set_image(self, image):
+        self.image = image
+        self.array = None
+
+
+def aspect_crop_box(size, aspect):
+    """ Largest centered (x, y, width, height) box of size with the aspect = (width, height) ratio """
+    width, height = size
+    if width * aspect[1] > height * aspect[0]:
+        crop_width, crop_height = max(1, round(height * aspect[0] / aspect[1])), height
+    else:
+        crop_width, crop_height = width, max(1, round(width * aspect[1] / aspect[0]))
+    return (width - crop_width) // 2, (height - crop_height) // 2, crop_width, crop_height
+
+
+def pipeline_crop(buffer, box=None, aspect=None):
+    """ Crop to box = (x, y, width, height), or the largest centered region with aspect = (width, height) """
+    x, y, width, height = box if box else aspect_crop_box(buffer.size, aspect)
+    if buffer.image is not None:
+        buffer.set_image(buffer.image.crop((x, y, x + width, y + height)))
+    else:
+        buffer.set_array(buffer.array[y:y + height, x:x + width], buffer.order)  # a view, no copy
+
+
+def pipeline_resize(buffer, size=None, resize=None):
+    """ Resize to an exact size or a ("width"|"height"|"both", w, h) setting """
+    new_size = tuple(size) if size else compute_resize_dims(buffer.size, resize)
+    if new_size == buffer.size:
+        return
+    if buffer.image is not None:
+        buffer.set_image(buffer.image.resize(new_size, Image.LANCZOS))
+    else:
+        shrinking = new_size[0] < buffer.size[0]
+        interpolation = cv2.INTER_AREA if shrinking else cv2.INTER_LANCZOS4
+        buffer.set_array(cv2.resize(buffer.array, new_size, interpolation=interpolation), buffer.order)
+
+
+# Passport framing (35x45 mm photo): the head, chin to crown, takes 34 of the
+# 45 mm (the common 32-36 mm rule) with about 4 mm above the crown.
+PASSPORT_HEAD_RATIO = 34 / 45
+PASSPORT_TOP_MARGIN = 4 / 45
+FACE_DETECT_SIZE = 640  # long side of the copy faces are detected on
+FACE_CASCADE_FILE = "haarcascade_frontalface_default.xml"
+
+_face_detector = None
+_face_lock = threading.Lock()
+
+
+def face_detector_path():
+    """ OpenCV's bundled Haar cascade, or a copy next to the app """
+    cascade_dir = getattr(getattr(cv2, "data", None), "haarcascades", "")
+    cascade_path = os.path.join(cascade_dir, FACE_CASCADE_FILE)
+    return cascade_path if os.path.exists(cascade_path) else resource_path(FACE_CASCADE_FILE)
+
+
+def face_detector_available():
+    return os.path.exists(face_detector_path())
+
+
+def get_face_detector():
+    """ The face detector, loaded on first use and reused (call with _face_lock held) """
+    global _face_detector
+    if _face_detector is None:
+        cascade_path = face_detector_path()
+        if not os.path.exists(cascade_path):
+            raise FileNotFoundError(f"Face detector not found: {cascade_path}")
+        _face_detector = cv2.CascadeClassifier(cascade_path)
+    return _face_detector
+
+
+def detect_face(buffer):
+    """ Largest face in the buffer as (x, y, width, height) at full resolution, or None """
+    width, height = buffer.size
+    if buffer.image is not None:
+        factor = max(1, -(-max(width, height) // FACE_DETECT_SIZE))
+        small = buffer.image.reduce(factor) if factor > 1 else buffer.image
+        gray = np.asarray(small.convert("L"))
+    else:
+        img = buffer.array
+        code = cv2.COLOR_RGB2GRAY if buffer.order == "RGB" else cv2.COLOR_BGR2GRAY
+        gray = cv2.cvtColor(np.ascontiguousarray(img[:, :, :3]), code)
+        scale = min(1.0, FACE_DETECT_SIZE / max(width, height))
+        if scale < 1.0:
+            gray = downscale(gray, (max(1, round(width * scale)), max(1, round(height * scale))))
+    gray = cv2.equalizeHist(gray)
+
+    with _face_lock:
+        faces = get_face_detector().detectMultiScale(gray, scaleFactor=1.1, minNeighbors=5, minSize=(24, 24))
+    if len(faces) == 0:
+        return None
+    x, y, face_width, face_height = max(faces, key=lambda face: face[2] * face[3])
+    scale = width / gray.shape[1]
+    return x * scale, y * scale, face_width * scale, face_height * scale
+
+
+def passport_crop_box(size, face):
+    """ (x, y, width, height) of a 35:45 crop framing the face box per PASSPORT_HEAD_RATIO """
+    width, height = size
+    x, y, face_width, face_height = face
+
+    # The Haar box runs from the brows to the chin; the head is about 1.5 times taller
+    chin = y + face_height * 1.05
+    head_height = face_height * 1.5
+    crop_height = head_height / PASSPORT_HEAD_RATIO
+    crop_width = crop_height * PASSPORT_SIZE[0] / PASSPORT_SIZE[1]
+
+    # Shrink (keeping the aspect) if the frame is bigger than the photo
+    fit = min(1.0, width / crop_width, height / crop_height)
+    crop_width, crop_height = crop_width * fit, crop_height * fit
+
+    left = x + face_width / 2 - crop_width / 2
+    top = chin - head_height - crop_height * PASSPORT_TOP_MARGIN
+    left = min(max(0, left), width - crop_width)
+    top = min(max(0, top), height - crop_height)
+    return round(left), round(top), max(1, round(crop_width)), max(1, round(crop_height))
+
+
+def pipeline_passport(buffer, face=True):
+    """
+    Crop to a passport frame around the largest detected face (or the
+    centered 35:45 region when there is none, or no detector) and resize
+    to passport size.
+    """
+    found = detect_face(buffer) if face and face_detector_available() else None
+    if found is not None:
+        pipeline_crop(buffer, box=passport_crop_box(buffer.size, found))
+    else:
+        pipeline_crop(buffer, aspect=PASSPORT_SIZE)
+    pipeline_resize(buffer, size=PASSPORT_SIZE)
+
+
+GRABCUT_MODES = ["fast", "full"]
+DEFAULT_GRABCUT_MODE = "fast"
+GRABCUT_WORK_SIZE = 400  # long side of the coarse GrabCut pass in "fast" mode
+GRABCUT_REFINE_SIZE = 2048  # long side at which the boundary filter is computed
+
+
+def grabcut_mask(img, mode=DEFAULT_GRABCUT_MODE):
+    """
+    Foreground mask (0/1) of a 3-channel uint8 array; channel order doesn't matter.
+    "full" runs GrabCut at full resolution. "fast" runs it on a copy of at
+    most GRABCUT_WORK_SIZE pixels and refines a narrow band around the
+    upsampled boundary with an edge-aware (guided) filter.
+    """
+    height, width = img.shape[:2]
+    if mode == "full" or max(width, height) <= GRABCUT_WORK_SIZE * 1.5:
+        return grabcut_mask_full(img)
+
+    # Reduced copies: one for the boundary filter, a smaller one for GrabCut
+    def reduced(source, long_side):
+        scale = min(1.0, long_side / max(width, height))
+        return downscale(source, (max(1, round(width * scale)), max(1, round(height * scale))))
+
+    medium = reduced(img, GRABCUT_REFINE_SIZE)
+    small = reduced(medium, GRABCUT_WORK_SIZE)
+    coarse = grabcut_mask_full(small)
+
+    # Band of coarse pixels on the boundary; everything else keeps the coarse label
+    kernel = np.ones((3, 3), np.uint8)
+    band = (cv2.dilate(coarse, kernel) != cv2.erode(coarse, kernel)).astype(np.uint8)
+    band = cv2.resize(band, (width, height), interpolation=cv2.INTER_NEAREST)
+    mask = cv2.resize(coarse, (width, height), interpolation=cv2.INTER_NEAREST)
+    points = cv2.findNonZero(band)
+    if points is None:
+        return mask
+    points = points.reshape(-1, 2)
+    xs, ys = points[:, 0], points[:, 1]
+
+    # Guided filter of the upsampled mask against the image. Its coefficients
+    # are computed on the medium copy and only evaluated on band pixels.
+    medium_height, medium_width = medium.shape[:2]
+    guide = cv2.cvtColor(medium, cv2.COLOR_BGR2GRAY).astype(np.float32) / 255
+    src = cv2.resize(coarse.astype(np.float32), (medium_width, medium_height), interpolation=cv2.INTER_LINEAR)
+    radius = max(2, round(medium_width / small.shape[1]))
+    a, b = guided_filter_coefficients(guide, src, radius, 1e-3)
+
+    map_x = (xs + 0.5) * (medium_width / width) - 0.5
+    map_y = (ys + 0.5) * (medium_height / height) - 0.5
+    gray = img[ys, xs].astype(np.float32) @ np.float32([0.114, 0.587, 0.299]) / 255  # same weights as BGR2GRAY
+    refined = sample_bilinear(a, map_x, map_y) * gray + sample_bilinear(b, map_x, map_y)
+    mask[ys, xs] = refined > 0.5
+    return mask
+
+
+def downscale(img, size):
+    """ INTER_AREA resize to (width, height); large inputs are first brought within 2x bilinearly """
+    if img.shape[1] > 2 * size[0] and img.shape[0] > 2 * size[1]:
+        img = cv2.resize(img, (size[0] * 2, size[1] * 2), interpolation=cv2.INTER_LINEAR)
+    return cv2.resize(img, size, interpolation=cv2.INTER_AREA)
+
+
+def sample_bilinear(array, xs, ys):
+    """ Bilinearly interpolated values of a 2D array at float coordinates """
+    height, width = array.shape
+    xs = np.clip(xs, 0, width - 1)
+    ys = np.clip(ys, 0, height - 1)
+    x0 = np.minimum(xs.astype(np.int32), width - 2) if width > 1 else np.zeros(len(xs), np.int32)
+    y0 = np.minimum(ys.astype(np.int32), height - 2) if height > 1 else np.zeros(len(ys), np.int32)
+    x1 = np.minimum(x0 + 1, width - 1)
+    y1 = np.minimum(y0 + 1, height - 1)
+    fx = (xs - x0).astype(np.float32)
+    fy = (ys - y0).astype(np.float32)
+    top = array[y0, x0] * (1 - fx) + array[y0, x1] * fx
+    bottom = array[y1, x0] * (1 - fx) + array[y1, x1] * fx
+    return top * (1 - fy) + bottom * fy
+
+
+def guided_filter_coefficients(guide, src, radius, eps):
+    """ Linear coefficients (a, b) of the guided filter, so that output = a * guide + b """
+    size = (2 * radius + 1, 2 * radius + 1)
+    mean_i = cv2.boxFilter(guide, -1, size)
+    mean_p = cv2.boxFilter(src, -1, size)
+    cov_ip = cv2.boxFilter(guide * src, -1, size) - mean_i * mean_p
+    var_i = cv2.boxFilter(guide * guide, -1, size) - mean_i * mean_i
+    a = cov_ip / (var_i + eps)
+    b = mean_p - a * mean_i
+    return cv2.boxFilter(a, -1, size), cv2.boxFilter(b, -1, size)
+
+
+def grabcut_mask_full(img):
+    """ GrabCut at the array's own resolution, initialised with a centered rectangle """
+    # Prepare mask and models for GrabCut
+    mask = np.zeros(img.shape[:2], np.uint8)
+    bgd_model = np.zeros((1, 65), np.float64)
+    fgd_model = np.zeros((1, 65), np.float64)
+
+    height, width = img.shape[:2]
+    rect_margin = min(width, height) // 6
+    rect = (rect_margin, rect_margin, width - 2*rect_margin, height - 2*rect_margin)
+
+    # Run GrabCut
+    cv2.grabCut(img, mask, rect, bgd_model, fgd_model, 5, cv2.GC_INIT_WITH_RECT)
+
+    # Mask: 1 (fg) and 3 (probable fg) are foreground
+    return np.where((mask == 2) | (mask == 0), 0, 1).astype("uint8")
+
+
+# Segmentation engines for background removal. "dnn" runs a salient-object /
+# portrait model in ONNX format (U^2-Net style, e.g. u2netp.onnx) through
+# cv2.dnn; "auto" uses it when the model file is present and GrabCut otherwise.
+SEGMENTATION_ENGINES = ["auto", "dnn", "grabcut"]
+SEGMENTATION_BATCH_SIZE = 8  # images per model run when a batch starts with remove_background
+DEFAULT_SEGMENTATION_ENGINE = "auto"
+SEGMENTATION_MODEL = {
+    "file": "u2netp.onnx",
+    "size": (320, 320),  # model input (width, height)
+    "mean": (0.485, 0.456, 0.406),  # RGB normalisation
+    "std": (0.229, 0.224, 0.225),
+}
+
+_segmentation_net = None
+_segmentation_lock = threading.Lock()  # cv2.dnn nets are not thread-safe
+
+
+def segmentation_model_available():
+    return os.path.exists(resource_path(SEGMENTATION_MODEL["file"]))
+
+
+def get_segmentation_net():
+    """ The segmentation network, loaded on first use and kept warm (call with _segmentation_lock held) """
+    global _segmentation_net
+    if _segmentation_net is None:
+        model_path = resource_path(SEGMENTATION_MODEL["file"])
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(f"Segmentation model not found: {model_path}")
+        _segmentation_net = cv2.dnn.readNetFromONNX(model_path)
+    return _segmentation_net
+
+
+def uses_segmentation_model(engine):
+    return engine == "dnn" or (engine == "auto" and segmentation_model_available())
+
+
+def dnn_mask_params(order):
+    """ mask_cache parameters of a DNN mask """
+    return "dnn", order, SEGMENTATION_MODEL["file"], SEGMENTATION_MODEL["size"]
+
+
+def dnn_foreground_probabilities(samples):
+    """
+    Foreground probability maps (0-1, at model size) for RGB uint8 arrays
+    already at the model's input size, run through the model as one batch.
+    """
+    size = SEGMENTATION_MODEL["size"]
+    mean = np.float32(SEGMENTATION_MODEL["mean"]).reshape(1, 3, 1, 1)
+    std = np.float32(SEGMENTATION_MODEL["std"]).reshape(1, 3, 1, 1)
+    blob = cv2.dnn.blobFromImages(samples, 1 / 255, size)
+    blob = (blob - mean) / std
+
+    with _segmentation_lock:
+        net = get_segmentation_net()
+        net.setInput(blob)
+        # The first output is the fused prediction (d0 for U^2-Net)
+        output = net.forward(net.getUnconnectedOutLayersNames()[0])
+
+    probabilities = []
+    for prediction in output.reshape(len(samples), size[1], size[0]):
+        low, high = float(prediction.min()), float(prediction.max())
+        probabilities.append((prediction - low) / (high - low) if high > low else prediction)
+    return probabilities
+
+
+def probability_mask(probability, shape):
+    """ Upsample a model-size probability map to shape = (height, width) and threshold it """
+    probability = cv2.resize(probability, (shape[1], shape[0]), interpolation=cv2.INTER_LINEAR)
+    return (probability > 0.5).astype(np.uint8)
+
+
+def dnn_foreground_masks(images):
+    """ Foreground masks (0/1) for a list of RGB uint8 arrays, segmented as one batch """
+    size = SEGMENTATION_MODEL["size"]
+    probabilities = dnn_foreground_probabilities([downscale(img, size) for img in images])
+    return [probability_mask(probability, img.shape) for img, probability in zip(images, probabilities)]
+
+
+MASK_CACHE_MEMORY = 64 * 1024 * 1024  # bytes of (bit-packed) masks kept in memory
+MASK_CACHE_DISK = 512 * 1024 * 1024  # bytes of masks kept in the optional cache folder
+MASK_CACHE_FOLDER_NAME = "masks"  # under user_cache_folder(), used by the GUI
+
+
+class MaskCache:
+    """
+    Foreground masks keyed by a hash of the image content and the
+    segmentation parameters. Masks are stored bit-packed in an in-memory
+    LRU and, when a folder is set, also on disk so batch reruns and later
+    sessions can reuse them. The oldest entries are evicted past the limits.
+    """
+
+    def __init__(self, memory_limit=MASK_CACHE_MEMORY, folder=None, disk_limit=MASK_CACHE_DISK):
+        self.memory_limit = memory_limit
+        self.folder = folder
+        self.disk_limit = disk_limit
+        self.entries = OrderedDict()  # key -> (shape, packed bits)
+        self.memory_used = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def key(img, params):
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(repr((img.shape, str(img.dtype), params)).encode())
+        digest.update(np.ascontiguousarray(img).data)
+        return digest.hexdigest()
+
+    def disk_path(self, key):
+        return os.path.join(self.folder, f"{key}.npz")
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+        if entry is None and self.folder and os.path.exists(self.disk_path(key)):
+            try:
+                with np.load(self.disk_path(key)) as data:
+                    entry = (tuple(data["shape"]), data["bits"])
+                self.store(key, entry)
+            except (OSError, ValueError, KeyError):
+                entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        shape, bits = entry
+        return np.unpackbits(bits, count=shape[0] * shape[1]).reshape(shape)
+
+    def put(self, key, mask):
+        entry = (mask.shape, np.packbits(mask.astype(bool), axis=None))
+        self.store(key, entry)
+        if self.folder:
+            try:
+                os.makedirs(self.folder, exist_ok=True)
+                temp_path = self.disk_path(key) + ".tmp"
+                with open(temp_path, "wb") as f:
+                    np.savez(f, shape=np.array(entry[0]), bits=entry[1])
+                os.replace(temp_path, self.disk_path(key))
+                self.prune_disk(keep=self.disk_path(key))
+            except OSError:
+                pass  # the disk cache is best effort
+
+    def store(self, key, entry):
+        with self.lock:
+            if key in self.entries:
+                return
+            self.entries[key] = entry
+            self.memory_used += entry[1].nbytes
+            while self.memory_used > self.memory_limit and len(self.entries) > 1:
+                _, (_, bits) = self.entries.popitem(last=False)
+                self.memory_used -= bits.nbytes
+
+    def prune_disk(self, keep=None):
+        """ Delete the least recently written masks (except keep) until the folder fits disk_limit """
+        files = [entry for entry in os.scandir(self.folder) if entry.name.endswith(".npz")]
+        total = sum(entry.stat().st_size for entry in files)
+        for entry in sorted(files, key=lambda entry: entry.stat().st_mtime):
+            if total <= self.disk_limit:
+                break
+            if entry.path == keep:
+                continue
+            total -= entry.stat().st_size
+            os.remove(entry.path)
+
+
+mask_cache = MaskCache()
+
+
+def foreground_mask(img, engine=DEFAULT_SEGMENTATION_ENGINE, mode=DEFAULT_GRABCUT_MODE, order="RGB", cache=True):
+    """ Foreground mask (0/1) of a 3-channel uint8 array with the given engine, cached in mask_cache """
+    if engine not in SEGMENTATION_ENGINES:
+        raise ValueError(f"Unknown segmentation engine: {engine}")
+    if mode not in GRABCUT_MODES:
+        raise ValueError(f"Unknown background removal mode: {mode}")
+    use_dnn = uses_segmentation_model(engine)
+    if use_dnn:
+        params = dnn_mask_params(order)
+    else:
+        params = ("grabcut", mode, GRABCUT_WORK_SIZE, GRABCUT_REFINE_SIZE)
+
+    key = mask_cache.key(img, params) if cache else None
+    mask = mask_cache.get(key) if cache else None
+    if mask is None:
+        if use_dnn:
+            rgb = img if order == "RGB" else cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+            mask = dnn_foreground_masks([rgb])[0]
+        else:
+            mask = grabcut_mask(img, mode)
+        if cache:
+            mask_cache.put(key, mask)
+    return mask
+
+
+def segmentation_input(buffer):
+    """ The buffer's array and its 3-channel color part, as background removal segments it """
+    img = buffer.as_array()
+    color = np.ascontiguousarray(img[:, :, :3]) if img.shape[2] == 4 else img
+    return img, color
+
+
+def prefetch_foreground_masks(files, batch_size=SEGMENTATION_BATCH_SIZE):
+    """
+    Segment files (as decoded, before any other edit) with the model in
+    batches of batch_size and store the masks in mask_cache, where a
+    pipeline starting with remove_background then finds them. Only a
+    model-size copy of each image is kept until its batch runs.
+    """
+    size = SEGMENTATION_MODEL["size"]
+    params = dnn_mask_params("RGB")
+    pending = []  # (cache key, (height, width), model-size copy)
+
+    def run_batch():
+        probabilities = dnn_foreground_probabilities([sample for _, _, sample in pending])
+        for (key, shape, _), probability in zip(pending, probabilities):
+            mask_cache.put(key, probability_mask(probability, shape))
+        pending.clear()
+
+    for file_path in files:
+        try:
+            with Image.open(file_path) as img:
+                _, color = segmentation_input(PipelineBuffer(img))
+        except Exception:
+            continue  # the conversion itself reports unreadable files
+        key = mask_cache.key(color, params)
+        if mask_cache.get(key) is None:
+            pending.append((key, color.shape[:2], downscale(color, size)))
+        if len(pending) == batch_size:
+            run_batch()
+    if pending:
+        run_batch()
+
+
+def pipeline_remove_background(buffer, engine=DEFAULT_SEGMENTATION_ENGINE, mode=DEFAULT_GRABCUT_MODE):
+    """ Remove the background (DNN segmentation or GrabCut); the result has an alpha channel """
+    img, color = segmentation_input(buffer)
+    has_alpha = img.shape[2] == 4
+    mask = foreground_mask(color, engine, mode, buffer.order)
+
+    # Apply the mask as the alpha channel
+    code = cv2.COLOR_RGB2RGBA if buffer.order == "RGB" else cv2.COLOR_BGR2BGRA
+    result = img.copy() if has_alpha else cv2.cvtColor(color, code)
+    result[:, :, 3] = mask * 255
+    buffer.set_array(result, buffer.order)
+
+
+# Super-resolution models (OpenCV dnn_superres .pb files in the app directory).
+# "quality" models are slower; the "fast" tier is meant for batches.
+SR_MODELS = {
+    "lapsrn_x2": {"algorithm": "lapsrn", "scale": 2, "file": "LapSRN_x2.pb", "tier": "quality"},
+    "lapsrn_x4": {"algorithm": "lapsrn", "scale": 4, "file": "LapSRN_x4.pb", "tier": "quality"},
+    "lapsrn_x8": {"algorithm": "lapsrn", "scale": 8, "file": "LapSRN_x8.pb", "tier": "quality"},
+    "fsrcnn_x2": {"algorithm": "fsrcnn", "scale": 2, "file": "FSRCNN_x2.pb", "tier": "fast"},
+    "fsrcnn_x3": {"algorithm": "fsrcnn", "scale": 3, "file": "FSRCNN_x3.pb", "tier": "fast"},
+    "fsrcnn_x4": {"algorithm": "fsrcnn", "scale": 4, "file": "FSRCNN_x4.pb", "tier": "fast"},
+    "fsrcnn_small_x2": {"algorithm": "fsrcnn", "scale": 2, "file": "FSRCNN-small_x2.pb", "tier": "fast"},
+    "espcn_x2": {"algorithm": "espcn", "scale": 2, "file": "ESPCN_x2.pb", "tier": "fast"},
+    "espcn_x3": {"algorithm": "espcn", "scale": 3, "file": "ESPCN_x3.pb", "tier": "fast"},
+    "espcn_x4": {"algorithm": "espcn", "scale": 4, "file": "ESPCN_x4.pb", "tier": "fast"},
+}
+SR_TIERS = ["quality", "fast"]
+DEFAULT_SR_MODEL = "lapsrn_x2"
+
+_sr_models = {}
+_sr_lock = threading.Lock()  # shared models; cv2.dnn is not thread-safe
+
+
+def sr_model_available(name):
+    return os.path.exists(resource_path(SR_MODELS[name]["file"]))
+
+
+def get_sr_model(name=DEFAULT_SR_MODEL):
+    """ A super-resolution model from SR_MODELS, loaded once (call with _sr_lock held) """
+    if name not in SR_MODELS:
+        raise ValueError(f"Unknown super-resolution model: {name}")
+    if name not in _sr_models:
+        info = SR_MODELS[name]
+        model_path = resource_path(info["file"])
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(f"Super-resolution model not found: {model_path}")
+        sr = cv2.dnn_superres.DnnSuperResImpl_create()
+        sr.readModel(model_path)
+        sr.setModel(info["algorithm"], info["scale"])
+        _sr_models[name] = sr
+    return _sr_models[name]
+
+
+def warm_up_sr_model(name=DEFAULT_SR_MODEL):
+    """ Load a model and run a tiny inference so the first real call starts fast """
+    try:
+        with _sr_lock:
+            get_sr_model(name).upsample(np.zeros((16, 16, 3), np.uint8))
+        return True
+    except Exception:
+        return False
+
+
+def plan_sr_chain(factor, tier="quality"):
+    """
+    Model names whose scales multiply to factor, with as few steps as
+    possible, from the available models of the tier (any tier if it has none).
+    """
+    if tier not in SR_TIERS:
+        raise ValueError(f"Unknown super-resolution tier: {tier}")
+    available = [name for name in SR_MODELS if sr_model_available(name)]
+    candidates = [name for name in available if SR_MODELS[name]["tier"] == tier] or available
+
+    best = {1: []}
+    for value in range(2, factor + 1):
+        for name in candidates:
+            scale = SR_MODELS[name]["scale"]
+            if value % scale == 0 and best.get(value // scale) is not None:
+                chain = best[value // scale] + [name]
+                if value not in best or len(chain) < len(best[value]):
+                    best[value] = chain
+    if factor not in best:
+        raise ValueError(f"No available super-resolution models can upscale by {factor}x")
+    return best[factor]
+
+
+SR_TILE_SIZE = 256  # input pixels per tile side
+SR_TILE_OVERLAP = 16  # input pixels shared by neighbouring tiles, blended in the output
+
+
+def tile_ranges(length, tile, overlap):
+    """ (start, end) ranges of tiles covering 0..length, neighbours sharing at least overlap """
+    if length <= tile:
+        return [(0, length)]
+    starts = list(range(0, length - tile, tile - overlap)) + [length - tile]
+    return [(start, start + tile) for start in starts]
+
+
+def blend_ramp(length):
+    """ Weights rising from 0 to 1 across an overlap of the given length """
+    return (np.arange(length, dtype=np.float32) + 0.5) / length
+
+
+def upscale_array(img, progress=None, model=DEFAULT_SR_MODEL, tile=SR_TILE_SIZE, overlap=SR_TILE_OVERLAP):
+    """
+    Super-resolution of a BGR uint8 array with one shared model, one
+    overlapping tile at a time so memory beyond the output stays bounded.
+    Each tile is cross-faded into its left and top neighbours over the overlap.
+    Tiles run one after another: the DNN backend already spreads each
+    inference over all cores, and one shared model keeps memory flat.
+    """
+    scale = SR_MODELS[model]["scale"]
+    height, width = img.shape[:2]
+    rows = tile_ranges(height, tile, overlap)
+    cols = tile_ranges(width, tile, overlap)
+    output = np.empty((height * scale, width * scale, 3), np.uint8)
+
+    done = 0
+    for row, (y0, y1) in enumerate(rows):
+        top = (rows[row - 1][1] - y0) * scale if row else 0  # overlap with the tile above
+        for col, (x0, x1) in enumerate(cols):
+            left = (cols[col - 1][1] - x0) * scale if col else 0  # overlap with the tile to the left
+            with _sr_lock:
+                result = get_sr_model(model).upsample(np.ascontiguousarray(img[y0:y1, x0:x1]))
+
+            target = output[y0 * scale:y1 * scale, x0 * scale:x1 * scale]
+            if top or left:
+                weight = np.ones(result.shape[:2], np.float32)
+                if left:
+                    weight[:, :left] *= blend_ramp(left)[None, :]
+                if top:
+                    weight[:top, :] *= blend_ramp(top)[:, None]
+                weight = weight[:, :, None]
+                result = (result * weight + target * (1 - weight) + 0.5).astype(np.uint8)
+            target[:] = result
+
+            done += 1
+            if progress:
+                progress(int(done * 100 / (len(rows) * len(cols))))
+    return output
+
+
+def upscale_chain(img, chain, progress=None):
+    """ Run upscale_array for each model of a chain (see plan_sr_chain) """
+    for index, model in enumerate(chain):
+        step_progress = None
+        if progress:
+            step_progress = lambda percent, index=index: progress(int((index + percent / 100) * 100 / len(chain)))
+        img = upscale_array(img, step_progress, model)
+    return img
+
+
+def pipeline_upscale(buffer, factor=2, tier="quality", model=None, progress=None):
+    """
+    Super-resolution by an integer factor, chaining models when needed, or
+    with one named model (expects BGR); alpha is resized bicubically.
+    """
+    chain = [model] if model else plan_sr_chain(int(factor), tier)
+    img = buffer.as_array("BGR")
+    alpha = None
+    if img.shape[2] == 4:
+        alpha = img[:, :, 3]
+        img = cv2.cvtColor(img, cv2.COLOR_BGRA2BGR)
+
+    # Apply super resolution
+    result = upscale_chain(img, chain, progress)
+    if alpha is not None:
+        alpha = cv2.resize(alpha, (result.shape[1], result.shape[0]), interpolation=cv2.INTER_CUBIC)
+        result = np.dstack([result, alpha])
+    buffer.set_array(result, "BGR")
+
+
+PIPELINE_OPERATIONS = {
+    "crop": pipeline_crop,
+    "resize": pipeline_resize,
+    "passport": pipeline_passport,
+    "remove_background": pipeline_remove_background,
+    "upscale": pipeline_upscale,
+}
+
+# Operations that take a progress callback (percent of that operation)
+PROGRESS_OPERATIONS = {"upscale"}
+
+# Edit tools offered as batch operations in the converter tab
+BATCH_EDIT_PRESETS = {
+    "None": None,
+    "Passport photo": [{"op": "passport"}],
+    "Remove background": [{"op": "remove_background"}],
+    "Upscale 2x": [{"op": "upscale", "factor": 2}],
+    "Upscale 2x (fast)": [{"op": "upscale", "factor": 2, "tier": "fast"}],
+    "Crop 1:1": [{"op": "crop", "aspect": [1, 1]}],
+    "Crop 4:3": [{"op": "crop", "aspect": [4, 3]}],
+    "Crop 3:4": [{"op": "crop", "aspect": [3, 4]}],
+    "Crop 16:9": [{"op": "crop", "aspect": [16, 9]}],
+}
+BATCH_WORKERS = os.cpu_count() or 1
+
+
+class ImagePipeline:
+    """
+    A declarative list of edit operations run on one in-memory buffer, e.g.
+
+        ImagePipeline([
+            {"op": "crop", "box": [0, 0, 800, 600]},
+            {"op": "resize", "size": [400, 300]},
+            {"op": "remove_background"},
+        ])
+
+    The buffer is converted between PIL and NumPy only when an operation
+    needs it, so a chain of OpenCV steps shares one array. Operations are
+    plain dicts, so a pipeline can be stored in JSON (job journal, CLI).
+    """
+
+    def __init__(self, operations=None):
+        self.operations = []
+        for operation in operations or []:
+            operation = dict(operation)
+            if operation.get("op") not in PIPELINE_OPERATIONS:
+                raise ValueError(f"Unknown pipeline operation: {operation.get('op')}")
+            self.operations.append(operation)
+
+    @classmethod
+    def parse(cls, spec):
+        """ Build a pipeline from a JSON string or a path to a JSON file """
+        if os.path.isfile(spec):
+            with open(spec, "r", encoding="utf-8") as f:
+                spec = f.read()
+        return cls(json.loads(spec))
+
+    def then(self, op, **params):
+        """ Return a new pipeline with one more operation appended """
+        return ImagePipeline(self.operations + [dict(params, op=op)])
+
+    def run(self, image, progress=None):
+        """ Run all operations; progress, if given, is called with the overall percentage """
+        buffer = PipelineBuffer(image)
+        count = len(self.operations)
+        for index, operation in enumerate(self.operations):
+            params = {key: value for key, value in operation.items() if key != "op"}
+            if progress and operation["op"] in PROGRESS_OPERATIONS:
+                params["progress"] = lambda percent, index=index: progress(int((index + percent / 100) * 100 / count))
+            PIPELINE_OPERATIONS[operation["op"]](buffer, **params)
+            if progress:
+                progress(int((index + 1) * 100 / count))
+        return buffer.as_image()
+
+
+# Largest proxy the Image Edit tab works on (the preview itself is 300x300)
+EDIT_PROXY_SIZE = (1024, 1024)
+EDIT_HISTORY_MEMORY = 128 * 1024 * 1024  # bytes of proxy snapshots kept for undo/redo
+
+
+def fit_scale(size, box):
+    """ Scale factor (at most 1) that fits size inside box """
+    return min(1.0, box[0] / size[0], box[1] / size[1])
+
+
+def operation_output_size(operation, size):
+    """ Full-resolution size after a pipeline operation, without running it """
+    op = operation["op"]
+    if op == "crop":
+        box = operation.get("box") or aspect_crop_box(size, operation["aspect"])
+        return tuple(box[2:4])
+    if op == "resize":
+        return tuple(operation["size"]) if operation.get("size") else compute_resize_dims(size, operation["resize"])
+    if op == "passport":
+        return PASSPORT_SIZE
+    if op == "upscale":
+        factor = SR_MODELS[operation["model"]]["scale"] if operation.get("model") else int(operation.get("factor", 2))
+        return size[0] * factor, size[1] * factor
+    return size
+
+
+def image_nbytes(img):
+    """ Approximate in-memory size of a PIL image """
+    return img.width * img.height * len(img.getbands())
+
+
+def open_edit_image(file_path):
+    """ Open an image for editing, upright according to its EXIF orientation """
+    img = Image.open(file_path)
+    orientation = img.getexif().get(0x0112, 1)  # Orientation
+    if orientation in EXIF_ORIENTATION_TRANSPOSE:
+        img = img.transpose(Image.Transpose[EXIF_ORIENTATION_TRANSPOSE[orientation]])
+    return img
+
+
+class EditStack:
+    """
+    The Image Edit tab's state: a full-resolution source plus the pipeline
+    operations applied to it. Every operation is also applied straight away
+    to a screen-sized proxy, which is what the preview shows; the full
+    resolution result is only rendered (render()) when saving.
+
+    Operations are given in full-resolution coordinates and scaled for the
+    proxy. Absolute resizes (resize, passport) re-fit the proxy to the new
+    size; a crop that leaves the proxy too small is re-rendered from the
+    source, which is cheap while every operation so far is a crop.
+
+    Undo/redo history is the operation list itself plus the proxy of each
+    state. Proxy snapshots are capped at history_memory bytes, evicting the
+    oldest first; an evicted state is re-rendered from the operations.
+    """
+
+    def __init__(self, source, proxy=None, proxy_size=EDIT_PROXY_SIZE, history_memory=EDIT_HISTORY_MEMORY):
+        self.source = source
+        self.proxy_size = proxy_size
+        self.history_memory = history_memory
+        self.operations = []
+        self.undo_states = []  # (proxy, scale) before each operation; proxy is None once evicted
+        self.redo_states = []  # (operation, proxy, scale) for undone operations, last is next
+        self.proxy = None
+        self.scale = 1.0  # proxy pixels per full-resolution pixel
+        self.rebuild(proxy)
+
+    @classmethod
+    def from_file(cls, file_path, proxy_size=EDIT_PROXY_SIZE, history_memory=EDIT_HISTORY_MEMORY):
+        # load_preview_image uses embedded previews / reduced-size decode for the proxy
+        return cls(open_edit_image(file_path), load_preview_image(file_path, proxy_size), proxy_size, history_memory)
+
+    @property
+    def size(self):
+        """ Full-resolution size after all operations """
+        size = self.source.size
+        for operation in self.operations:
+            size = operation_output_size(operation, size)
+        return size
+
+    def rebuild(self, proxy=None):
+        """ Recompute the proxy from the source; leading crops are applied at full resolution first """
+        image = self.source
+        index = 0
+        while index < len(self.operations) and self.operations[index]["op"] == "crop":
+            x, y, width, height = self.operations[index].get("box") or aspect_crop_box(image.size, self.operations[index]["aspect"])
+            image = image.crop((x, y, x + width, y + height))
+            index += 1
+
+        if proxy is None or index:
+            proxy = image.copy()
+            proxy.thumbnail(self.proxy_size, Image.LANCZOS)
+        self.proxy = proxy
+        self.scale = proxy.width / image.width
+
+        size = image.size
+        for operation in self.operations[index:]:
+            self.apply_to_proxy(operation, size)
+            size = operation_output_size(operation, size)
+
+    def apply_to_proxy(self, operation, size, progress=None):
+        op = operation["op"]
+        if op == "passport":
+            # The frame depends on where the face is, so detect it on the proxy too
+            self.scale = fit_scale(PASSPORT_SIZE, self.proxy_size)
+            proxy_operation = operation
+        elif op == "resize":
+            out_size = operation_output_size(operation, size)
+            self.scale = fit_scale(out_size, self.proxy_size)
+            proxy_operation = {"op": "resize", "size": [max(1, round(v * self.scale)) for v in out_size]}
+        elif op == "crop" and operation.get("box"):
+            proxy_operation = dict(operation, box=[max(1, round(v * self.scale)) for v in operation["box"]])
+        elif op == "upscale" and fit_scale(operation_output_size(operation, self.proxy.size), self.proxy_size) < 1:
+            # The upscaled proxy wouldn't fit, so its detail would be thumbnailed away again;
+            # preview with a plain resize and leave super-resolution to render()
+            out_size = operation_output_size(operation, size)
+            self.scale = fit_scale(out_size, self.proxy_size)
+            proxy_operation = {"op": "resize", "size": [max(1, round(v * self.scale)) for v in out_size]}
+        else:  # aspect crops, remove_background and small upscales don't depend on the scale
+            proxy_operation = operation
+        self.proxy = ImagePipeline([proxy_operation]).run(self.proxy, progress)
+
+        # Keep the proxy screen-sized (e.g. after an upscale)
+        if self.proxy.width > self.proxy_size[0] or self.proxy.height > self.proxy_size[1]:
+            width, height = self.proxy.size
+            self.proxy.thumbnail(self.proxy_size, Image.LANCZOS)
+            self.scale *= self.proxy.width / width
+
+    def push(self, operation, progress=None):
+        """ Add an operation (full-resolution coordinates) and update the proxy """
+        size = self.size
+        self.undo_states.append((self.proxy, self.scale))
+        self.redo_states = []
+        self.operations.append(dict(operation))
+        self.apply_to_proxy(operation, size, progress)
+
+        # A zoomed-in crop leaves a small proxy; re-render it from the source when that is cheap
+        wanted = fit_scale(self.size, self.proxy_size)
+        only_crops = all(o["op"] == "crop" for o in self.operations)
+        if operation["op"] == "crop" and only_crops and self.scale < wanted / 1.5:
+            self.rebuild()
+        self.trim_history()
+
+    @property
+    def can_undo(self):
+        return bool(self.operations)
+
+    @property
+    def can_redo(self):
+        return bool(self.redo_states)
+
+    def undo(self):
+        """ Drop the last operation; returns False when there is nothing to undo """
+        if not self.operations:
+            return False
+        operation = self.operations.pop()
+        proxy, scale = self.undo_states.pop()
+        self.redo_states.append((operation, self.proxy, self.scale))
+        if proxy is None:
+            self.rebuild()
+        else:
+            self.proxy, self.scale = proxy, scale
+        return True
+
+    def redo(self):
+        """ Re-apply the last undone operation; returns False when there is nothing to redo """
+        if not self.redo_states:
+            return False
+        operation, proxy, scale = self.redo_states.pop()
+        self.undo_states.append((self.proxy, self.scale))
+        self.operations.append(operation)
+        if proxy is None:
+            self.rebuild()
+        else:
+            self.proxy, self.scale = proxy, scale
+        self.trim_history()
+        return True
+
+    def history_bytes(self):
+        states = [state[0] for state in self.undo_states] + [state[1] for state in self.redo_states]
+        return sum(image_nbytes(proxy) for proxy in states if proxy is not None)
+
+    def trim_history(self):
+        """ Evict proxy snapshots, oldest undo states first, then the furthest redo states """
+        total = self.history_bytes()
+        for index, (proxy, scale) in enumerate(self.undo_states):
+            if total <= self.history_memory:
+                return
+            if proxy is not None:
+                total -= image_nbytes(proxy)
+                self.undo_states[index] = (None, scale)
+        for index, (operation, proxy, scale) in enumerate(self.redo_states):
+            if total <= self.history_memory:
+                return
+            if proxy is not None:
+                total -= image_nbytes(proxy)
+                self.redo_states[index] = (operation, None, scale)
+
+    def crop_view(self):
+        """
+        Image to show in the crop dialog and its scale to full resolution.
+        While every operation is a crop this is the full-resolution region.
+        """
+        if all(o["op"] == "crop" for o in self.operations):
+            return ImagePipeline(self.operations).run(self.source), 1.0
+        return self.proxy, self.scale
+
+    def render(self, progress=None):
+        """ Full-resolution result of all operations """
+        return ImagePipeline(self.operations).run(self.source, progress)
+
+
+def remove_bg_with_opencv(image):
+    """ Remove the background with GrabCut; returns an RGBA image """
+    return ImagePipeline([{"op": "remove_background"}]).run(image)
+
+
+def upscale_with_lapsrn(image):
+    """ 2x super-resolution with the bundled LapSRN model """
+    return ImagePipeline([{"op": "upscale"}]).run(image)
+
+
+# Optional filesystem notifications for watch mode (falls back to polling)
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    WATCHDOG_AVAILABLE = False
+
+
+class HotFolderWatcher:
+    """
+    Convert image files as they land in a folder (top level only, so the
+    Converted_to_<format> output folder is never picked up).
+    New files are found through watchdog notifications when available,
+    otherwise by polling. A file is converted once its size and mtime have
+    been unchanged for settle_time seconds, so files still being copied are
+    left alone. Conversions run on a thread pool that is started (and kept
+    warm) for the whole watch session.
+    """
+
+    def __init__(self, folder, target_format, quality, resize=None,
+                 profile=DEFAULT_ENCODER_PROFILE, on_converted=None,
+                 poll_interval=0.5, settle_time=0.5, workers=None):
+        from concurrent.futures import ThreadPoolExecutor
+
+        self.folder = folder
+        self.target_format = target_format
+        self.quality = quality
+        self.resize = resize
+        self.profile = profile
+        self.on_converted = on_converted  # callback(file_path, target_path or None, seconds)
+        self.poll_interval = poll_interval
+        self.settle_time = settle_time
+        self.workers = workers or os.cpu_count() or 2
+        self.output_folder = get_output_folder([folder], target_format)
+
+        self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="editara-watch")
+        self.wake = threading.Event()
+        self.stopped = threading.Event()
+        self.lock = threading.Lock()
+        self.pending = {}  # path -> (size, mtime, time it was last seen changing)
+        self.handled = {}  # path -> mtime that was converted
+        self.thread = None
+        self.observer = None
+
+    def start(self):
+        os.makedirs(self.output_folder, exist_ok=True)
+        self.warm_up()
+        if WATCHDOG_AVAILABLE:
+            watcher = self
+
+            class Handler(FileSystemEventHandler):
+                def on_any_event(self, event):
+                    # Ignore open/read events (our own conversions would trigger them)
+                    if not event.is_directory and event.event_type in ["created", "modified", "moved", "closed"]:
+                        watcher.notify(getattr(event, "dest_path", "") or event.src_path)
+
+            self.observer = Observer()
+            self.observer.schedule(Handler(), self.folder, recursive=False)
+            self.observer.start()
+        self.scan()  # files that were already waiting
+        self.thread = threading.Thread(target=self.run, name="editara-watch", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+        self.wake.set()
+        if self.observer:
+            self.observer.stop()
+            self.observer.join()
+        if self.thread:
+            self.thread.join()
+        self.executor.shutdown(wait=True)
+
+    def warm_up(self):
+        # Load codec plugins and spin up every pool thread before the first file arrives
+        Image.init()
+        barrier = threading.Barrier(self.workers)
+        for _ in range(self.workers):
+            self.executor.submit(barrier.wait, 5)
+
+    def is_candidate(self, path):
+        ext = os.path.splitext(path)[1].lower()
+        return (os.path.dirname(os.path.abspath(path)) == os.path.abspath(self.folder)
+                and ext.lstrip('.') in SUPPORTED_FORMATS
+                and ext != f".{self.target_format.lower()}")
+
+    def notify(self, path):
+        if self.is_candidate(path):
+            with self.lock:
+                self.pending.setdefault(path, (-1, -1, time.monotonic()))
+            self.wake.set()
+
+    def scan(self):
+        try:
+            entries = list(os.scandir(self.folder))
+        except OSError:
+            return
+        with self.lock:
+            for entry in entries:
+                if entry.is_file() and self.is_candidate(entry.path) and entry.path not in self.pending:
+                    if self.handled.get(entry.path) != entry.stat().st_mtime:
+                        self.pending[entry.path] = (-1, -1, time.monotonic())
+
+    def check_pending(self):
+        now = time.monotonic()
+        ready = []
+        with self.lock:
+            for path, (size, mtime, changed_at) in list(self.pending.items()):
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    del self.pending[path]  # removed or renamed
+                    continue
+                if self.handled.get(path) == stat.st_mtime:
+                    del self.pending[path]  # already converted this version
+                elif (stat.st_size, stat.st_mtime) != (size, mtime):
+                    self.pending[path] = (stat.st_size, stat.st_mtime, now)
+                elif now - changed_at >= self.settle_time and stat.st_size > 0:
+                    del self.pending[path]
+                    self.handled[path] = stat.st_mtime
+                    ready.append(path)
+        for path in ready:
+            self.executor.submit(self.convert, path)
+        return bool(self.pending)
+
+    def convert(self, file_path):
+        base_name = os.path.splitext(os.path.basename(file_path))[0]
+        target_path = os.path.join(self.output_folder, f"{base_name}.{self.target_format.lower()}")
+        start = time.perf_counter()
+        try:
+            convert_image_file(file_path, target_path, self.target_format,
+                               self.quality, self.resize, self.profile)
+        except Exception as e:
+            print(f"Error converting {file_path}: {e}")
+            target_path = None
+        if self.on_converted:
+            self.on_converted(file_path, target_path, time.perf_counter() - start)
+
+    def run(self):
+        while not self.stopped.is_set():
+            waiting = self.check_pending()
+            # Re-check soon while files are settling; otherwise sleep until notified or the next poll
+            if waiting:
+                timeout = min(self.poll_interval, self.settle_time / 2)
+            else:
+                timeout = None if self.observer else self.poll_interval
+            self.wake.wait(timeout)
+            self.wake.clear()
+            if not self.observer:
+                self.scan()
+
+
+class ConversionRequestHandler(BaseHTTPRequestHandler):
+    """ HTTP handler for ConversionService (the service is self.server.service) """
+    protocol_version = "HTTP/1.1"
+    server_version = f"Editara/{__version__}"
+
+    def log_message(self, format, *args):
+        if self.server.service.verbose:
+            super().log_message(format, *args)
+
+    def send_json(self, status, payload, headers=None):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def send_error_json(self, status, message, headers=None):
+        # The request body may be unread, so don't reuse the connection
+        self.close_connection = True
+        headers = dict(headers or {}, Connection="close")
+        self.send_json(status, {"error": message}, headers)
+
+    def read_body(self, max_size):
+        """ Stream the request body (Content-Length or chunked) into a spooled temp file """
+        import tempfile
+
+        body = tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024)
+        received = 0
+
+        def copy(length):
+            nonlocal received
+            while length > 0:
+                chunk = self.rfile.read(min(length, 64 * 1024))
+                if not chunk:
+                    raise ValueError("Request body ended early")
+                body.write(chunk)
+                length -= len(chunk)
+                received += len(chunk)
+                if received > max_size:
+                    raise OverflowError("Request body too large")
+
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            while True:
+                size = int(self.rfile.readline().split(b";")[0].strip() or b"0", 16)
+                if size == 0:
+                    while self.rfile.readline() not in [b"\r\n", b"\n", b""]:
+                        pass  # skip trailers
+                    break
+                copy(size)
+                self.rfile.readline()  # CRLF after each chunk
+        else:
+            copy(int(self.headers.get("Content-Length") or 0))
+
+        body.seek(0)
+        return body
+
+    def do_GET(self):
+        service = self.server.service
+        if urlparse(self.path).path == "/health":
+            self.send_json(200, {
+                "status": "ok",
+                "version": __version__,
+                "workers": service.workers,
+                "in_flight": service.in_flight,
+                "capacity": service.capacity,
+            })
+        else:
+            self.send_error_json(404, "Not found")
+
+    def do_POST(self):
+        from concurrent.futures import TimeoutError as FutureTimeout
+        from urllib.parse import parse_qs
+
+        service = self.server.service
+        received_at = time.perf_counter()
+        url = urlparse(self.path)
+        operation = url.path.rstrip("/")
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+
+        if operation not in ConversionService.OPERATIONS:
+            self.send_error_json(404, f"Unknown operation: {operation}")
+            return
+
+        # Bounded queue: reject instead of piling up work
+        if not service.acquire_slot():
+            self.send_error_json(429, "Server busy, retry later", {"Retry-After": "1"})
+            return
+
+        try:
+            body = self.read_body(service.max_body_size)
+            future = service.executor.submit(service.run_operation, operation, params, body, time.perf_counter())
+        except OverflowError as e:
+            service.release_slot()
+            self.send_error_json(413, str(e))
+            return
+        except ValueError as e:
+            service.release_slot()
+            self.send_error_json(400, str(e))
+            return
+        except Exception:
+            # e.g. the client dropped the connection mid-upload
+            service.release_slot()
+            raise
+
+        future.add_done_callback(lambda _: service.release_slot())
+
+        try:
+            output, content_type, timings = future.result(timeout=service.request_timeout)
+        except FutureTimeout:
+            future.cancel()
+            self.send_error_json(504, "Processing timed out")
+            return
+        except ValueError as e:
+            self.send_error_json(400, str(e))
+            return
+        except Image.UnidentifiedImageError:
+            self.send_error_json(415, "Request body is not a supported image")
+            return
+        except Exception as e:
+            self.send_error_json(500, str(e))
+            return
+
+        timings["total"] = (time.perf_counter() - received_at) * 1000
+        output.seek(0, os.SEEK_END)
+        length = output.tell()
+        output.seek(0)
+
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(length))
+        self.send_header("Server-Timing", ", ".join(f"{name};dur={ms:.1f}" for name, ms in timings.items()))
+        self.send_header("X-Processing-Time-Ms", f"{timings['total']:.1f}")
+        self.end_headers()
+        shutil.copyfileobj(output, self.wfile, 64 * 1024)
+        output.close()
+
+
+class ConversionService:
+    """
+    Local HTTP API for Editara's image operations, backed by one shared
+    worker pool. POST the image as the request body (Content-Length or
+    chunked); options go in the query string:
+
+        /convert?format=webp&quality=90&profile=balanced
+        /resize?width=800&height=600&format=png   (give one side to keep aspect ratio)
+        /remove-background                        (PNG with alpha)
+        /upscale?format=png                       (2x LapSRN)
+        /pipeline?ops=[...]&format=png            (ImagePipeline operation list as JSON)
+
+    GET /health reports pool usage. At most workers + queue_size requests
+    are accepted at once; the rest get 429 with Retry-After. Responses
+    carry Server-Timing (queue, decode, process, encode, total) and
+    X-Processing-Time-Ms headers.
+    """
+
+    OPERATIONS = ["/convert", "/resize", "/remove-background", "/upscale", "/pipeline"]
+
+    def __init__(self, host="127.0.0.1", port=8765, workers=None, queue_size=16,
+                 request_timeout=300, max_body_size=512 * 1024 * 1024, verbose=False):
+        from concurrent.futures import ThreadPoolExecutor
+
+        self.workers = workers or os.cpu_count() or 2
+        self.capacity = self.workers + queue_size
+        self.request_timeout = request_timeout
+        self.max_body_size = max_body_size
+        self.verbose = verbose
+        self.in_flight = 0
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="editara-service")
+        self.server = ThreadingHTTPServer((host, port), ConversionRequestHandler)
+        self.server.daemon_threads = True
+        self.server.service = self
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def acquire_slot(self):
+        with self.lock:
+            if self.in_flight >= self.capacity:
+                return False
+            self.in_flight += 1
+            return True
+
+    def release_slot(self):
+        with self.lock:
+            self.in_flight -= 1
+
+    def run_operation(self, operation, params, body, queued_at):
+        """ Decode, process and encode one request; returns (output file, content type, timings in ms) """
+        import mimetypes
+        import tempfile
+
+        timings = {"queue": (time.perf_counter() - queued_at) * 1000}
+
+        start = time.perf_counter()
+        with body:
+            img = Image.open(body)
+            img.load()
+        source_format = normalize_format(img.format or "png")
+        timings["decode"] = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        quality = int(params.get("quality", 90))
+        operations = []
+        if operation == "/convert":
+            target_format = params.get("format", "webp")
+        elif operation == "/pipeline":
+            try:
+                operations = json.loads(params.get("ops", "[]"))
+            except ValueError:
+                raise ValueError("ops must be a JSON list of operations")
+            target_format = params.get("format", source_format)
+        elif operation == "/resize":
+            width = int(params["width"]) if "width" in params else None
+            height = int(params["height"]) if "height" in params else None
+            if width and height:
+                resize = ("both", width, height)
+            elif width:
+                resize = ("width", width, None)
+            elif height:
+                resize = ("height", None, height)
+            else:
+                raise ValueError("resize needs width and/or height")
+            operations = [{"op": "resize", "resize": resize}]
+            target_format = params.get("format", source_format)
+        elif operation == "/remove-background":
+            operations = [{
+                "op": "remove_background",
+                "engine": params.get("engine", DEFAULT_SEGMENTATION_ENGINE),
+                "mode": params.get("mode", DEFAULT_GRABCUT_MODE),
+            }]
+            target_format = "png"
+        else:  # /upscale
+            operations = [{"op": "upscale", "factor": int(params.get("factor", 2)), "tier": params.get("tier", "quality")}]
+            target_format = params.get("format", "png")
+        if normalize_format(target_format) not in SUPPORTED_FORMATS:
+            raise ValueError(f"Unsupported format: {target_format}")
+        profile = params.get("profile", DEFAULT_ENCODER_PROFILE)
+        if profile not in ENCODER_PROFILE_NAMES:
+            raise ValueError(f"Unknown profile: {profile}")
+        img = prepare_image_for_save(ImagePipeline(operations).run(img), target_format)
+        timings["process"] = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        output = tempfile.SpooledTemporaryFile(max_size=16 * 1024 * 1024)
+        img.save(output, format=pil_format_name(target_format), **get_save_args(target_format, quality, profile))
+        timings["encode"] = (time.perf_counter() - start) * 1000
+
+        content_type = mimetypes.guess_type(f"image.{normalize_format(target_format)}")[0]
+        return output, content_type or "application/octet-stream", timings
+
+    def start(self):
+        """ Serve in a background thread (returns immediately) """
+        self.thread = threading.Thread(target=self.server.serve_forever, name="editara-service", daemon=True)
+        self.thread.start()
+
+    def serve_forever(self):
+        self.server.serve_forever()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+        if self.thread:
+            self.thread.join()
+        self.executor.shutdown(wait=True)
+
+
+def benchmark_encoder_profiles(files, formats=None, quality=90):
+    """
+    Encode every file with every profile of every format (in memory).
+    Returns rows of (format, profile, encode ms/MP, bytes/MP).
+    """
+    import io
+
+    formats = formats or list(ENCODER_PROFILES)
+    images = []
+    for file_path in files:
+        with Image.open(file_path) as img:
+            img.load()
+            images.append(img.copy())
+    if not images:
+        return []
+
+    rows = []
+    for fmt in formats:
+        fmt = normalize_format(fmt)
+        pil_format = pil_format_name(fmt)
+        for profile in ENCODER_PROFILE_NAMES:
+            total_ms = 0.0
+            total_bytes = 0
+            total_mp = 0.0
+            for img in images:
+                img = prepare_image_for_save(img, fmt)
+                buffer = io.BytesIO()
+                start = time.perf_counter()
+                img.save(buffer, format=pil_format, **get_save_args(fmt, quality, profile))
+                total_ms += (time.perf_counter() - start) * 1000
+                total_bytes += buffer.tell()
+                total_mp += (img.size[0] * img.size[1]) / 1_000_000
+            rows.append((fmt, profile, total_ms / total_mp, total_bytes / total_mp))
+    return rows
+
+
+def benchmark_background_removal(files):
+    """
+    Run every background removal method on every file: GrabCut at full
+    resolution and multi-scale, plus the DNN engine when its model is present.
+    Returns rows of (file, method, ms, megapixels, IoU with the full GrabCut mask).
+    """
+    methods = [
+        ("grabcut-full", lambda img: grabcut_mask(img, "full")),
+        ("grabcut-fast", lambda img: grabcut_mask(img, "fast")),
+    ]
+    if segmentation_model_available():
+        methods.append(("dnn", lambda img: foreground_mask(img, "dnn", cache=False)))
+        with _segmentation_lock:
+            get_segmentation_net()  # load outside the timing
+
+    rows = []
+    for file_path in files:
+        with Image.open(file_path) as img:
+            img = np.array(img.convert("RGB"))
+        megapixels = img.shape[0] * img.shape[1] / 1_000_000
+
+        reference = None
+        for method, function in methods:
+            start = time.perf_counter()
+            mask = function(img).astype(bool)
+            elapsed = (time.perf_counter() - start) * 1000
+            if reference is None:
+                reference = mask
+            union = np.logical_or(mask, reference).sum()
+            iou = np.logical_and(mask, reference).sum() / union if union else 1.0
+            rows.append((os.path.basename(file_path), method, elapsed, megapixels, iou))
+    return rows
+
+
+def benchmark_sr_models(files):
+    """
+    Downscale every file by each available model's scale, upscale it back and
+    compare with the original. Returns rows of (model, scale, ms per output
+    MP, PSNR dB), with a bicubic baseline per scale.
+    """
+    models = [name for name in SR_MODELS if sr_model_available(name)]
+    for name in models:
+        warm_up_sr_model(name)  # load outside the timing
+
+    images = []
+    for file_path in files:
+        with Image.open(file_path) as img:
+            images.append(cv2.cvtColor(np.array(img.convert("RGB")), cv2.COLOR_RGB2BGR))
+
+    rows = []
+    for name in ["bicubic"] + models:
+        scales = sorted({SR_MODELS[model]["scale"] for model in models}) if name == "bicubic" else [SR_MODELS[name]["scale"]]
+        for scale in scales:
+            total_ms = 0.0
+            total_mp = 0.0
+            psnr = []
+            for img in images:
+                height, width = (img.shape[0] // scale) * scale, (img.shape[1] // scale) * scale
+                original = img[:height, :width]
+                small = cv2.resize(original, (width // scale, height // scale), interpolation=cv2.INTER_AREA)
+                start = time.perf_counter()
+                if name == "bicubic":
+                    result = cv2.resize(small, (width, height), interpolation=cv2.INTER_CUBIC)
+                else:
+                    result = upscale_array(small, model=name)
+                total_ms += (time.perf_counter() - start) * 1000
+                total_mp += width * height / 1_000_000
+                psnr.append(cv2.PSNR(original, result))
+            if images:
+                rows.append((name, scale, total_ms / total_mp, sum(psnr) / len(psnr)))
+    return rows
 
 
 # Worker thread for background processing
@@ -73,72 +2309,155 @@ class Worker(QThread):
     finished = pyqtSignal(tuple)
     error = pyqtSignal(str)
     
-    def __init__(self, function, args):
+    def __init__(self, function, args, report_progress=False):
         super().__init__()
         self.function = function
         self.args = args
+        self.report_progress = report_progress  # pass progress=<callback> to the function
         
     def run(self):
         try:
-            result = self.function(*self.args)
+            if self.report_progress:
+                result = self.function(*self.args, progress=self.progress.emit)
+            else:
+                result = self.function(*self.args)
             self.finished.emit((result,))  # Wrap in a tuple!
         except Exception as e:
             self.error.emit(str(e))
 
+# Update check: one conditional GET of the latest release, cached on disk
+UPDATE_REPO = "basharulalammazu/editara-windows"
+UPDATE_API_URL = os.environ.get("EDITARA_UPDATE_URL", f"https://api.github.com/repos/{UPDATE_REPO}/releases/latest")
+UPDATE_CACHE_TTL = 60 * 60  # seconds a cached answer is trusted without asking the server
+UPDATE_TIMEOUT = (3.05, 5)  # (connect, read) seconds
+UPDATE_CACHE_NAME = "update_check.json"
+
+_update_session = None
+
+
+def user_cache_folder():
+    """ Per-user folder for Editara's caches """
+    if platform.system() == "Windows":
+        base = os.environ.get("LOCALAPPDATA", os.path.expanduser("~"))
+    elif platform.system() == "Darwin":  # macOS
+        base = os.path.join(os.path.expanduser("~"), "Library", "Caches")
+    else:  # Linux and others
+        base = os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache"))
+    return os.path.join(base, "Editara")
+
+
+def get_update_session():
+    """ A pooled HTTP session, shared by the update check and the download """
+    global _update_session
+    if _update_session is None:
+        session = requests.Session()
+        session.headers.update({
+            "Accept": "application/vnd.github+json",
+            "User-Agent": f"Editara/{__version__}",
+        })
+        _update_session = session
+    return _update_session
+
+
+def load_update_cache(cache_path):
+    try:
+        with open(cache_path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_update_cache(cache_path, cache):
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        temp_path = cache_path + ".tmp"
+        with open(temp_path, "w") as f:
+            json.dump(cache, f)
+        os.replace(temp_path, cache_path)
+    except OSError:
+        pass  # the cache is only an optimisation
+
+
+def update_result(release):
+    if not release:
+        return {"status": "no_update"}
+    return {"status": "ok", "latest_version": release["tag_name"].lstrip("v"), "latest": release}
+
+
+def check_latest_release(url=None, cache_path=None, ttl=UPDATE_CACHE_TTL, session=None, timeout=UPDATE_TIMEOUT):
+    """
+    Latest release as the (result, error) pair UpdateCheckWorker emits. A
+    cached answer younger than ttl is returned without any request;
+    otherwise one GET goes out with the cached ETag, and a 304 reuses the
+    cached release. Network failures of that call map to "No Internet"
+    (the host can't be resolved or reached) or "Server Down".
+    """
+    url = url or UPDATE_API_URL
+    cache_path = cache_path or os.path.join(user_cache_folder(), UPDATE_CACHE_NAME)
+    session = session or get_update_session()
+
+    cache = load_update_cache(cache_path)
+    if cache.get("url") != url:
+        cache = {}
+    if cache and time.time() - cache.get("checked_at", 0) < ttl:
+        return update_result(cache.get("release")), None
+
+    headers = {"If-None-Match": cache["etag"]} if cache.get("etag") else {}
+    try:
+        response = session.get(url, headers=headers, timeout=timeout)
+    except requests.ConnectionError as e:
+        unreachable = isinstance(e, requests.ConnectTimeout) or "resolve" in str(e).lower() or "getaddrinfo" in str(e)
+        return None, "No Internet" if unreachable else "Server Down"
+    except requests.Timeout:
+        return None, "Server Down"
+
+    if response.status_code == 304 and cache:
+        release = cache.get("release")
+    elif response.status_code == 200:
+        latest = response.json()
+        release = {
+            "tag_name": latest["tag_name"],
+            "html_url": latest.get("html_url"),
+            "assets": [{"name": asset["name"], "browser_download_url": asset["browser_download_url"]}
+                       for asset in latest.get("assets", [])],
+        }
+    elif response.status_code == 404:
+        release = None  # the repository has no published release
+    elif response.status_code in (403, 429) and "rate limit" in response.text.lower():
+        return None, "Rate Limit Exceeded"
+    elif response.status_code >= 500:
+        return None, "Server Down"
+    else:
+        return None, f"Update Error: {response.status_code}"
+
+    save_update_cache(cache_path, {
+        "url": url,
+        "etag": cache.get("etag") if response.status_code == 304 else response.headers.get("ETag"),
+        "checked_at": time.time(),
+        "release": release,
+    })
+    return update_result(release), None
+
+
 class UpdateCheckWorker(QThread):
     finished = pyqtSignal(object, object)  # (result, error)
 
     def run(self):
         try:
-            # Check internet connection
-            try:
-                requests.get("https://www.google.com", timeout=5)
-            except requests.RequestException:
-                self.finished.emit(None, "No Internet")
-                return
-
-            # Check GitHub server
-            try:
-                requests.get("https://www.github.com", timeout=5)
-            except requests.RequestException:
-                self.finished.emit(None, "Server Down")
-                return
-
-            repo = "basharulalammazu/editara-windows"
-            api_url = f"https://api.github.com/repos/{repo}/releases"
-            response = requests.get(api_url, timeout=5)
-            if response.status_code == 403 and "rate limit" in response.text.lower():
-                self.finished.emit(None, "Rate Limit Exceeded")
-                return
-
-            if response.status_code != 200:
-                self.finished.emit(None, f"Update Error: {response.status_code}")
-                return
-
-
-            releases = response.json()
-            if not releases:
-                self.finished.emit({"status": "no_update"}, None)
-                return
-
-            latest = sorted(
-                releases,
-                key=lambda r: version.parse(r["tag_name"].lstrip("v")),
-                reverse=True
-            )[0]
-            latest_version = latest["tag_name"].lstrip("v")
-            self.finished.emit({
-                "status": "ok",
-                "latest_version": latest_version,
-                "latest": latest
-            }, None)
+            result, error = check_latest_release()
+            self.finished.emit(result, error)
         except Exception as e:
             self.finished.emit(None, str(e))
 
 
+# Carries hot-folder watcher callbacks (pool threads) to the GUI thread
+class WatchSignals(QObject):
+    converted = pyqtSignal(str, object, float)  # (file path, target path or None, seconds)
+
+
 # Background removal worker
 class RemoveBgWorker(QThread):
-    finished = pyqtSignal(Image.Image)
+    finished = pyqtSignal(object)  # PIL image
     error = pyqtSignal(str)
     
     def __init__(self, image):
@@ -147,7 +2466,7 @@ class RemoveBgWorker(QThread):
         
     def run(self):
         try:
-            img_no_bg = self.remove_bg_with_opencv(self.image)
+            img_no_bg = remove_bg_with_opencv(self.image)
             self.finished.emit(img_no_bg)
         except Exception as e:
             self.error.emit(str(e))
@@ -253,6 +2572,118 @@ class LoadingSpinner(QWidget):
 
 # Add this class after the CardFrame class and before Editara:
 
+CROP_TILE_SIZE = 256  # display pixels per tile side
+CROP_TILE_CACHE = 256  # tiles kept (at most ~64 MB of RGBA pixmaps)
+
+
+class TiledImageView(QWidget):
+    """
+    Zoomable view of a PIL image for the crop dialog. Only the tiles that
+    are exposed at the current zoom are rendered and uploaded, from a lazily
+    built pyramid of half-size levels, and kept in a small LRU cache, so
+    memory does not grow with the image size. The crop rectangle is drawn
+    as an overlay on top.
+    """
+
+    def __init__(self, image, parent=None):
+        super().__init__(parent)
+        if image.mode not in ["RGB", "RGBA"]:
+            image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+        self.pyramid = [image]  # Halving levels for zooming out, built on demand
+        self.tiles = OrderedDict()  # (zoom, tile x, tile y) -> QPixmap
+        self.crop_rect = None  # (x, y, width, height) in image pixels
+        self.zoom_factor = 1.0
+        self.set_zoom(1.0)
+
+    def set_zoom(self, zoom_factor):
+        self.zoom_factor = zoom_factor
+        width, height = self.pyramid[0].size
+        self.setFixedSize(max(1, int(width * zoom_factor)), max(1, int(height * zoom_factor)))
+        self.update()
+
+    def pyramid_level(self, zoom_factor):
+        """ Smallest pyramid level that still has at least zoom_factor of the full resolution """
+        index = 0
+        while zoom_factor <= 0.5 ** (index + 1) and min(self.pyramid[index].size) >= 2:
+            index += 1
+            if index == len(self.pyramid):
+                self.pyramid.append(self.pyramid[-1].reduce(2))
+        return self.pyramid[index], self.pyramid[index].width / self.pyramid[0].width
+
+    def tile(self, tile_x, tile_y):
+        key = (self.zoom_factor, tile_x, tile_y)
+        if key in self.tiles:
+            self.tiles.move_to_end(key)
+            return self.tiles[key]
+
+        x, y = tile_x * CROP_TILE_SIZE, tile_y * CROP_TILE_SIZE
+        width = min(CROP_TILE_SIZE, self.width() - x)
+        height = min(CROP_TILE_SIZE, self.height() - y)
+        if width <= 0 or height <= 0:
+            return None
+
+        # Resample just this tile's region of the nearest level
+        level, level_scale = self.pyramid_level(self.zoom_factor)
+        factor = level_scale / self.zoom_factor  # level pixels per display pixel
+        box = (
+            x * factor,
+            y * factor,
+            min((x + width) * factor, level.width),
+            min((y + height) * factor, level.height)
+        )
+        region = level.resize((width, height), Image.BILINEAR, box=box)
+        data = region.tobytes()
+        if region.mode == "RGBA":
+            qimg = QImage(data, width, height, width * 4, QImage.Format.Format_RGBA8888)
+        else:
+            qimg = QImage(data, width, height, width * 3, QImage.Format.Format_RGB888)
+        pixmap = QPixmap.fromImage(qimg)
+
+        self.tiles[key] = pixmap
+        while len(self.tiles) > CROP_TILE_CACHE:
+            self.tiles.popitem(last=False)
+        return pixmap
+
+    def map_to_image(self, pos):
+        return int(pos.x() / self.zoom_factor), int(pos.y() / self.zoom_factor)
+
+    def overlay_rect(self):
+        if self.crop_rect is None:
+            return None
+        x, y, width, height = self.crop_rect
+        return QRect(
+            round(x * self.zoom_factor),
+            round(y * self.zoom_factor),
+            round(width * self.zoom_factor),
+            round(height * self.zoom_factor)
+        )
+
+    def set_crop_rect(self, crop_rect):
+        old_rect = self.overlay_rect()
+        self.crop_rect = crop_rect
+        new_rect = self.overlay_rect()
+
+        # Repaint only the area covered by the old and new rectangles
+        dirty = old_rect.united(new_rect) if old_rect is not None else new_rect
+        if dirty is not None:
+            self.update(dirty.adjusted(-2, -2, 2, 2))
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        exposed = event.rect()
+        for tile_y in range(exposed.top() // CROP_TILE_SIZE, exposed.bottom() // CROP_TILE_SIZE + 1):
+            for tile_x in range(exposed.left() // CROP_TILE_SIZE, exposed.right() // CROP_TILE_SIZE + 1):
+                pixmap = self.tile(tile_x, tile_y)
+                if pixmap is not None:
+                    painter.drawPixmap(tile_x * CROP_TILE_SIZE, tile_y * CROP_TILE_SIZE, pixmap)
+
+        rect = self.overlay_rect()
+        if rect is not None:
+            painter.setPen(QPen(QColor(255, 0, 0), 2))
+            painter.drawRect(rect)
+        painter.end()
+
+
 class ImageCropDialog(QDialog):
     def __init__(self, image, parent=None):
         super().__init__(parent)
@@ -263,20 +2694,7 @@ class ImageCropDialog(QDialog):
         
         # Get original image dimensions
         self.orig_width, self.orig_height = image.size
-        
-        # Convert PIL image to QImage and QPixmap
-        img_array = np.array(image)
-        self.height, self.width = img_array.shape[:2]
-        
-        if image.mode == "RGB":
-            qimg = QImage(img_array.data, self.width, self.height, 
-                        self.width * 3, QImage.Format.Format_RGB888)
-        else:  # RGBA
-            qimg = QImage(img_array.data, self.width, self.height, 
-                        self.width * 4, QImage.Format.Format_RGBA8888)
-        
-        self.pixmap = QPixmap.fromImage(qimg)
-        self.display_pixmap = self.pixmap  # Pixmap that will be displayed (possibly scaled)
+        self.width, self.height = image.size
         
         # Setup UI
         layout = QVBoxLayout(self)
@@ -310,15 +2728,13 @@ class ImageCropDialog(QDialog):
         
         layout.addLayout(zoom_layout)
         
-        # Image display area
-        self.image_label = QLabel()
-        self.image_label.setPixmap(self.display_pixmap)
-        self.image_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        # Image display area, rendered tile by tile (the crop rectangle is drawn as an overlay)
+        self.image_view = TiledImageView(image)
         
         # Make it scrollable if the image is large
         self.scroll = QScrollArea()
-        self.scroll.setWidget(self.image_label)
-        self.scroll.setWidgetResizable(True)
+        self.scroll.setWidget(self.image_view)
+        self.scroll.setAlignment(Qt.AlignmentFlag.AlignCenter)
         layout.addWidget(self.scroll)
         
         
@@ -378,10 +2794,10 @@ class ImageCropDialog(QDialog):
         self.current_rectangle = None
         
         # Enable mouse tracking on label
-        self.image_label.setMouseTracking(True)
-        self.image_label.mousePressEvent = self.mouse_press
-        self.image_label.mouseMoveEvent = self.mouse_move
-        self.image_label.mouseReleaseEvent = self.mouse_release
+        self.image_view.setMouseTracking(True)
+        self.image_view.mousePressEvent = self.mouse_press
+        self.image_view.mouseMoveEvent = self.mouse_move
+        self.image_view.mouseReleaseEvent = self.mouse_release
         
         # Make dialog larger
         self.resize(800, 600)
@@ -397,8 +2813,8 @@ class ImageCropDialog(QDialog):
     def fit_to_view(self):
         """Resize image to fit in the viewport"""
         viewport_size = self.scroll.viewport().size()
-        scale_w = viewport_size.width() / self.pixmap.width()
-        scale_h = viewport_size.height() / self.pixmap.height()
+        scale_w = viewport_size.width() / self.width
+        scale_h = viewport_size.height() / self.height
         self.zoom_factor = min(scale_w, scale_h) * 0.95  # 95% of available space
         self.zoom_label.setText(f"Zoom: {int(self.zoom_factor * 100)}%")
         self.update_display()
@@ -407,43 +2823,17 @@ class ImageCropDialog(QDialog):
         
     def update_display(self):
         """Update displayed image with current zoom"""
-        if hasattr(self, 'modified_pixmap'):
-            # If we've already drawn a crop rectangle, update that version
-            source_pixmap = self.modified_pixmap
-        else:
-            # Otherwise use the original pixmap
-            source_pixmap = self.pixmap
-        
-        # Calculate new size based on zoom
-        new_width = int(self.width * self.zoom_factor)
-        new_height = int(self.height * self.zoom_factor)
-        
-        if new_width > 0 and new_height > 0:
-            self.display_pixmap = source_pixmap.scaled(
-                new_width, new_height, 
-                Qt.AspectRatioMode.KeepAspectRatio, 
-                Qt.TransformationMode.SmoothTransformation
-            )
-            self.image_label.setPixmap(self.display_pixmap)
-            self.image_label.setFixedSize(new_width, new_height)
-
-    
+        # Only the visible tiles are rendered, from the nearest pyramid level
+        self.image_view.set_zoom(self.zoom_factor)
 
     def mouse_press(self, event):
         self.drawing = True
         self.start_point = event.pos()
         
-        # Adjust for scroll position and image position
-        scroll_area = self.image_label.parent().parent()
-        self.scroll_x = scroll_area.horizontalScrollBar().value()
-        self.scroll_y = scroll_area.verticalScrollBar().value()
-        
-        # Calculate offset if image is centered
-        self.offset_x = max(0, (self.image_label.width() - self.pixmap.width()) // 2)
-        self.offset_y = max(0, (self.image_label.height() - self.pixmap.height()) // 2)
-        
-        x = max(0, min(event.pos().x() - self.offset_x + self.scroll_x, self.width))
-        y = max(0, min(event.pos().y() - self.offset_y + self.scroll_y, self.height))
+        # Map from label to image coordinates (accounts for centering and zoom)
+        x, y = self.image_view.map_to_image(event.pos())
+        x = max(0, min(x, self.width))
+        y = max(0, min(y, self.height))
         
         self.x_spin.setValue(x)
         self.y_spin.setValue(y)
@@ -452,9 +2842,10 @@ class ImageCropDialog(QDialog):
         if not self.drawing:
             return
             
-        # Calculate current position with scroll adjustments
-        x = max(0, min(event.pos().x() - self.offset_x + self.scroll_x, self.width))
-        y = max(0, min(event.pos().y() - self.offset_y + self.scroll_y, self.height))
+        # Calculate current position in image coordinates
+        x, y = self.image_view.map_to_image(event.pos())
+        x = max(0, min(x, self.width))
+        y = max(0, min(y, self.height))
         
         # Update width/height spins
         width = max(1, x - self.x_spin.value())
@@ -468,24 +2859,13 @@ class ImageCropDialog(QDialog):
         self.update_crop_rect()
     
     def update_crop_rect(self):
-        # Create a copy of the original image to draw on
-        if hasattr(self, 'modified_pixmap'):
-            del self.modified_pixmap
-        self.modified_pixmap = self.pixmap.copy()
-        
-        # Draw rectangle on the image
-        painter = QPainter(self.modified_pixmap)
-        painter.setPen(QPen(QColor(255, 0, 0), 2))
-        painter.drawRect(
+        # Move the overlay rectangle; the pixmap itself is left untouched
+        self.image_view.set_crop_rect((
             self.x_spin.value(), 
             self.y_spin.value(),
             self.w_spin.value(),
             self.h_spin.value()
-        )
-        painter.end()
-        
-        # Update displayed image
-        self.image_label.setPixmap(self.modified_pixmap)
+        ))
     
     def preview_crop(self):
         # Show a preview of the cropped image
@@ -526,6 +2906,14 @@ class ImageCropDialog(QDialog):
         
         preview.exec()
     
+    def get_crop_box(self):
+        # Return the selection as (x, y, width, height)
+        width = self.w_spin.value()
+        height = self.h_spin.value()
+        if width <= 0 or height <= 0:
+            return None
+        return self.x_spin.value(), self.y_spin.value(), width, height
+
     def get_cropped_image(self):
         # Return the cropped PIL Image
         x = self.x_spin.value()
@@ -584,26 +2972,48 @@ class Editara(QMainWindow):
         self.file_count = 0
         self.is_converting = False
         self.output_folder = ""
+        self.conversion_summary = None
+        self.watcher = None
         self.mode = "Image"  # Image or Video
         
         # Variables for image edit
         self.edit_image = None
         self.edit_image_path = None
+        self.edit_stack = None
         
+        # Keep background removal masks on disk so batch reruns reuse them
+        if mask_cache.folder is None:
+            mask_cache.folder = os.path.join(user_cache_folder(), MASK_CACHE_FOLDER_NAME)
+
         # Load theme
         theme_name = self.load_theme()
         self.theme = DARK_THEME if theme_name == "dark" else LIGHT_THEME
         
         # Create menu bar
-        self.setup_menu()
+        with startup_profile.phase("setup_menu"):
+            self.setup_menu()
         
         # Create main UI
-        self.create_ui()
+        with startup_profile.phase("create_ui"):
+            self.create_ui()
         
         # Apply theme
-        self.apply_theme()
+        with startup_profile.phase("apply_theme"):
+            self.apply_theme()
+
+        # Once the window is up, load the super-resolution model in the
+        # background so Improve Quality starts fast (this also imports OpenCV).
+        # Not a daemon: exiting while OpenCV is mid-load aborts the process.
+        QTimer.singleShot(STARTUP_WARM_UP_DELAY_MS, lambda: threading.Thread(target=warm_up_sr_model).start())
     
 
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        # First paint of the window main() showed: startup is done once the event loop is free
+        if "show" in startup_profile.marks and "first_paint" not in startup_profile.marks:
+            startup_profile.mark("first_paint")
+            QTimer.singleShot(0, report_startup_time)
+
     def show_info(self, title, message):
         msg = QMessageBox(self)
         msg.setWindowTitle(title)
@@ -671,6 +3081,13 @@ class Editara(QMainWindow):
         self.overlay.show()
         self.overlay.raise_()
 
+    def update_loading(self, percent):
+        # Progress from a worker: shown on the spinner label and in the status bar
+        if hasattr(self, 'spinner') and self.spinner is not None:
+            message = self.spinner.label.text().split(" (")[0]
+            self.spinner.label.setText(f"{message} ({percent}%)")
+            self.statusBar().showMessage(f"{message} ({percent}%)")
+
     def hide_loading(self):
         if hasattr(self, 'overlay') and self.overlay is not None:
             self.overlay.hide()
@@ -720,6 +3137,25 @@ class Editara(QMainWindow):
         image_edit_action = QAction("Image Edit", self)
         image_edit_action.triggered.connect(self.show_image_edit)
         tools_menu.addAction(image_edit_action)
+
+        tools_menu.addSeparator()
+
+        resume_action = QAction("Resume Interrupted Job...", self)
+        resume_action.triggered.connect(self.resume_job)
+        tools_menu.addAction(resume_action)
+        
+        # Edit menu
+        edit_menu = menubar.addMenu("Edit")
+
+        undo_action = QAction("Undo", self)
+        undo_action.setShortcut(QKeySequence.StandardKey.Undo)
+        undo_action.triggered.connect(self.undo_edit)
+        edit_menu.addAction(undo_action)
+
+        redo_action = QAction("Redo", self)
+        redo_action.setShortcut(QKeySequence.StandardKey.Redo)
+        redo_action.triggered.connect(self.redo_edit)
+        edit_menu.addAction(redo_action)
         
         # Theme menu
         theme_menu = menubar.addMenu("Theme")
@@ -802,6 +3238,11 @@ class Editara(QMainWindow):
         preview_button = StyledButton("Preview")
         preview_button.clicked.connect(self.preview_files)
         file_layout.addWidget(preview_button)
+
+        self.watch_button = StyledButton("Watch Folder")
+        self.watch_button.setToolTip("Convert images automatically as they are dropped into a folder")
+        self.watch_button.clicked.connect(self.toggle_watch_folder)
+        file_layout.addWidget(self.watch_button)
         
         source_layout.addLayout(file_layout)
         
@@ -880,6 +3321,66 @@ class Editara(QMainWindow):
         self.quality_slider.valueChanged.connect(self.update_quality_label)
 
         settings_layout.addWidget(self.quality_container)  # Add the container to the layout
+
+        # Encoder profile (for images)
+        self.profile_container = QWidget()
+        profile_layout = QHBoxLayout(self.profile_container)
+
+        profile_label = QLabel("Encoder Profile:")
+        profile_label.setFixedWidth(120)
+        profile_layout.addWidget(profile_label)
+
+        self.profile_combo = QComboBox()
+        self.profile_combo.addItems(ENCODER_PROFILE_NAMES)
+        self.profile_combo.setCurrentText(DEFAULT_ENCODER_PROFILE)
+        self.profile_combo.setToolTip("fast: quickest encode, small: smallest files")
+        profile_layout.addWidget(self.profile_combo)
+        profile_layout.addStretch()
+
+        settings_layout.addWidget(self.profile_container)
+
+        # Target quality (SSIM) instead of a fixed quality value
+        self.target_container = QWidget()
+        target_layout = QHBoxLayout(self.target_container)
+
+        self.target_checkbox = QCheckBox("Target SSIM (JPG/WEBP):")
+        self.target_checkbox.setToolTip("Pick the lowest quality per image that reaches this similarity")
+        target_layout.addWidget(self.target_checkbox)
+
+        self.target_spin = QDoubleSpinBox()
+        self.target_spin.setRange(0.80, 0.999)
+        self.target_spin.setDecimals(3)
+        self.target_spin.setSingleStep(0.005)
+        self.target_spin.setValue(0.95)
+        self.target_spin.setEnabled(False)
+        target_layout.addWidget(self.target_spin)
+        target_layout.addStretch()
+
+        self.target_checkbox.toggled.connect(self.target_spin.setEnabled)
+        self.target_checkbox.toggled.connect(lambda checked: self.quality_slider.setEnabled(not checked))
+
+        settings_layout.addWidget(self.target_container)
+
+        # Edit tools applied to every image, on a process pool
+        self.batch_edit_container = QWidget()
+        batch_edit_layout = QHBoxLayout(self.batch_edit_container)
+
+        batch_edit_label = QLabel("Batch Edit:")
+        batch_edit_label.setFixedWidth(120)
+        batch_edit_layout.addWidget(batch_edit_label)
+
+        self.batch_edit_combo = QComboBox()
+        self.batch_edit_combo.addItems(list(BATCH_EDIT_PRESETS))
+        self.batch_edit_combo.setToolTip(f"Applied to every image before saving, {BATCH_WORKERS} files at a time")
+        batch_edit_layout.addWidget(self.batch_edit_combo)
+        batch_edit_layout.addStretch()
+
+        settings_layout.addWidget(self.batch_edit_container)
+
+        # Duplicate detection (for images)
+        self.dedup_checkbox = QCheckBox("Convert duplicate files once (link the copies)")
+        self.dedup_checkbox.setChecked(True)
+        settings_layout.addWidget(self.dedup_checkbox)
         
         # Resize options
         resize_group = QGroupBox("Resize")
@@ -995,6 +3496,18 @@ class Editara(QMainWindow):
         quality_btn = StyledButton("Improve Quality", self.theme["accent"])
         quality_btn.clicked.connect(self.improve_quality)
         buttons_layout.addWidget(quality_btn)
+
+        undo_btn = StyledButton("Undo", self.theme["accent"])
+        undo_btn.clicked.connect(self.undo_edit)
+        buttons_layout.addWidget(undo_btn)
+
+        redo_btn = StyledButton("Redo", self.theme["accent"])
+        redo_btn.clicked.connect(self.redo_edit)
+        buttons_layout.addWidget(redo_btn)
+
+        save_btn = StyledButton("Save Image", self.theme["accent"])
+        save_btn.clicked.connect(lambda: self.save_edit_image())
+        buttons_layout.addWidget(save_btn)
         
         self.image_edit_layout.addLayout(buttons_layout)
 
@@ -1098,7 +3611,7 @@ class Editara(QMainWindow):
                 thread = QThread()
                 def download():
                     try:
-                        with requests.get(download_url, stream=True) as r:
+                        with get_update_session().get(download_url, stream=True, timeout=UPDATE_TIMEOUT) as r:
                             r.raise_for_status()
                             with open(save_path, 'wb') as f:
                                 for chunk in r.iter_content(chunk_size=8192):
@@ -1146,15 +3659,11 @@ class Editara(QMainWindow):
         if file_path:
             try:
                 self.edit_image_path = file_path
-                self.edit_image = Image.open(file_path)
-                
+                self.edit_stack = EditStack.from_file(file_path)
+                self.edit_image = self.edit_stack.source
+
                 # Create preview
-                img = self.edit_image.copy()
-                img.thumbnail((300, 300))
-                qimage = self.pil_to_qimage(img)
-                pixmap = QPixmap.fromImage(qimage)
-                
-                self.edit_image_label.setPixmap(pixmap)
+                self.show_edit_preview()
                 self.statusBar().showMessage(f"Loaded image: {os.path.basename(file_path)}")
             except Exception as e:
                 msg = QMessageBox(self)
@@ -1165,9 +3674,88 @@ class Editara(QMainWindow):
         else:
             self.edit_image_path = None
             self.edit_image = None
+            self.edit_stack = None
             self.edit_image_label.setText("No image uploaded")
             self.edit_image_label.setPixmap(QPixmap())
 
+    def show_edit_preview(self):
+        # The preview comes from the edit stack's proxy, never the full-resolution image
+        preview = self.edit_stack.proxy.copy()
+        preview.thumbnail((300, 300))
+        qimage = self.pil_to_qimage(preview)
+        pixmap = QPixmap.fromImage(qimage)
+        self.edit_image_label.setPixmap(pixmap)
+
+    def edit_busy(self):
+        # An edit tool is still running on the stack in a worker thread
+        workers = [getattr(self, name, None) for name in ("bg_worker", "quality_worker", "save_worker")]
+        return any(worker is not None and worker.isRunning() for worker in workers)
+
+    def undo_edit(self):
+        if not self.edit_stack or self.edit_busy():
+            return
+        if self.edit_stack.undo():
+            self.show_edit_preview()
+            self.statusBar().showMessage("Undo")
+        else:
+            self.statusBar().showMessage("Nothing to undo")
+
+    def redo_edit(self):
+        if not self.edit_stack or self.edit_busy():
+            return
+        if self.edit_stack.redo():
+            self.show_edit_preview()
+            self.statusBar().showMessage("Redo")
+        else:
+            self.statusBar().showMessage("Nothing to redo")
+
+    def save_edit_image(self, title="Save Image", default_path="", filters="PNG (*.png);;JPEG (*.jpg);;All files (*.*)"):
+        if not self.edit_stack:
+            msg = QMessageBox(self)
+            msg.setWindowTitle("Error")
+            msg.setText("Please upload an image first.")
+            msg.setIconPixmap(self.get_accent_icon("warning").pixmap(48, 48))
+            msg.exec()
+            return
+
+        file_path, _ = QFileDialog.getSaveFileName(self, title, default_path, filters)
+        if not file_path:
+            return
+        if not os.path.splitext(file_path)[1]:
+            file_path += ".png"
+
+        # Render the full-resolution result only now, in a worker thread
+        self.show_loading("Saving full-resolution image...")
+        self.save_worker = Worker(self.render_edit_image, (file_path,), report_progress=True)
+        self.save_worker.progress.connect(self.update_loading)
+        self.save_worker.finished.connect(self.edit_image_saved)
+        self.save_worker.error.connect(self.edit_image_save_error)
+        self.save_worker.start()
+
+    def render_edit_image(self, file_path, progress=None):
+        target_format = os.path.splitext(file_path)[1]
+        img = prepare_image_for_save(self.edit_stack.render(progress), target_format)
+        img.save(file_path)
+        return file_path
+
+    def edit_image_saved(self, result_tuple):
+        self.hide_loading()
+        file_path = result_tuple[0]
+        self.statusBar().showMessage(f"Saved: {os.path.basename(file_path)}")
+        msg = QMessageBox(self)
+        msg.setWindowTitle("Success")
+        msg.setText(f"Image saved:\n{file_path}")
+        msg.setIconPixmap(self.get_accent_icon("info").pixmap(48, 48))
+        msg.exec()
+
+    def edit_image_save_error(self, error):
+        self.hide_loading()
+        msg = QMessageBox(self)
+        msg.setWindowTitle("Error")
+        msg.setText(f"Failed to save image:\n{error}")
+        msg.setIconPixmap(self.get_accent_icon("error").pixmap(48, 48))
+        msg.exec()
+
     def passport_size_image(self):
         if not self.edit_image:
             msg = QMessageBox(self)
@@ -1177,33 +3765,20 @@ class Editara(QMainWindow):
             msg.exec()
             return
         
-        # Show loading spinner
-        self.show_loading("Creating Passport Photo...")
-    
-        # Resize to passport size (413x531 pixels, 300 DPI)
+        # Crop around the face and resize to passport size (413x531 pixels, 300 DPI)
         try:
-            passport_img = self.edit_image.copy()
-            passport_img = passport_img.resize((413, 531), Image.LANCZOS)
-            
-            self.hide_loading()  # Hide spinner after processing
+            self.edit_stack.push({"op": "passport"})
+            self.show_edit_preview()
+            self.statusBar().showMessage("Passport size applied")
+
             # Save dialog
-            file_path, _ = QFileDialog.getSaveFileName(
-                self,
+            self.save_edit_image(
                 "Save Passport Size Image",
                 os.path.join(self.get_downloads_folder(), "passport_size_image.jpg"),
                 "JPEG (*.jpg);;PNG (*.png);;All files (*.*)"
             )
-            
-            # ...after saving...
-            if file_path:
-                msg = QMessageBox(self)
-                msg.setWindowTitle("Success")
-                msg.setText(f"Passport size image saved:\n{file_path}")
-                msg.setIconPixmap(self.get_accent_icon("info").pixmap(48, 48))
-                msg.exec()
 
         except Exception as e:
-            self.hide_loading()
             msg = QMessageBox(self)
             msg.setWindowTitle("Error")
             msg.setText(f"Failed to create passport image:\n{str(e)}")
@@ -1226,8 +3801,8 @@ class Editara(QMainWindow):
             self.show_loading("Removing Background...")
             self.statusBar().showMessage("Removing background, please wait...")
 
-            # Run background removal in a worker thread
-            self.bg_worker = Worker(self.remove_bg_with_opencv, (self.edit_image,))
+            # Run background removal on the proxy in a worker thread
+            self.bg_worker = Worker(self.edit_stack.push, ({"op": "remove_background"},))
             self.bg_worker.finished.connect(self.bg_removal_done)
             self.bg_worker.error.connect(self.bg_removal_error)
             self.bg_worker.start()
@@ -1242,81 +3817,18 @@ class Editara(QMainWindow):
             msg.exec()
 
     def remove_bg_with_opencv(self, image):
-        import cv2
-        import numpy as np
-        from PIL import Image
-
-        # Convert PIL to OpenCV image
-        img = np.array(image)
-
-        if len(img.shape) == 2:  # Grayscale fallback
-            img = cv2.cvtColor(img, cv2.COLOR_GRAY2BGR)
-
-        has_alpha = img.shape[2] == 4 if len(img.shape) == 3 else False
-
-        # Convert to proper format for OpenCV
-        if has_alpha:
-            img_rgb = cv2.cvtColor(img, cv2.COLOR_RGBA2RGB)
-        else:
-            img_rgb = cv2.cvtColor(img, cv2.COLOR_RGB2BGR)
-
-        # Prepare mask and models for GrabCut
-        mask = np.zeros(img_rgb.shape[:2], np.uint8)
-        bgd_model = np.zeros((1, 65), np.float64)
-        fgd_model = np.zeros((1, 65), np.float64)
-
-        height, width = img_rgb.shape[:2]
-        rect_margin = min(width, height) // 6
-        rect = (rect_margin, rect_margin, width - 2*rect_margin, height - 2*rect_margin)
-
-        # Run GrabCut
-        cv2.grabCut(img_rgb, mask, rect, bgd_model, fgd_model, 5, cv2.GC_INIT_WITH_RECT)
-
-        # Mask: 1 (fg) and 3 (probable fg) are foreground
-        mask2 = np.where((mask == 2) | (mask == 0), 0, 1).astype("uint8")
-
-        # Apply the mask
-        result = img.copy()
-        if has_alpha:
-            result[:, :, 3] = mask2 * 255
-        else:
-            result_rgba = cv2.cvtColor(img_rgb, cv2.COLOR_BGR2RGBA)
-            result_rgba[:, :, 3] = mask2 * 255
-            result = result_rgba
-
-        return Image.fromarray(result)
+        return remove_bg_with_opencv(image)
 
 
 
     def bg_removal_done(self, result_tuple):
         self.hide_loading()  # Hide spinner after processing
         
-        # Unpack the image from the tuple
-        img_no_bg = result_tuple[0]
-        
-        # Continue with existing code
-        display_img = img_no_bg.copy()
-        display_img.thumbnail((300, 300))
-        qimage = self.pil_to_qimage(display_img)
-        pixmap = QPixmap.fromImage(qimage)
-        
-        self.edit_image_label.setPixmap(pixmap)
+        self.show_edit_preview()
         self.statusBar().showMessage("Background removed successfully")
         
         # Ask to save
-        file_path, _ = QFileDialog.getSaveFileName(
-            self,
-            "Save Background-Removed Image",
-            "",
-            "PNG (*.png);;All files (*.*)"
-        )
-        
-        if file_path:
-            msg = QMessageBox(self)
-            msg.setWindowTitle("Success")
-            msg.setText(f"Background-removed image saved:\n{file_path}")
-            msg.setIconPixmap(self.get_accent_icon("info").pixmap(48, 48))
-            msg.exec()
+        self.save_edit_image("Save Background-Removed Image", "", "PNG (*.png);;All files (*.*)")
 
 
     def bg_removal_error(self, error):
@@ -1339,39 +3851,21 @@ class Editara(QMainWindow):
             return
         
         try:
-            # Create and show the crop dialog
-            crop_dialog = ImageCropDialog(self.edit_image, self)
+            # Create and show the crop dialog (full resolution while only crops were applied)
+            crop_view, scale = self.edit_stack.crop_view()
+            crop_dialog = ImageCropDialog(crop_view, self)
             result = crop_dialog.exec()
             
             # If user clicked Crop (accept), process the cropped image
             if result == QDialog.DialogCode.Accepted:
-                cropped_img = crop_dialog.get_cropped_image()
-                if cropped_img:
-                    # Update display
-                    preview = cropped_img.copy()
-                    preview.thumbnail((300, 300))
-                    qimage = self.pil_to_qimage(preview)
-                    pixmap = QPixmap.fromImage(qimage)
-                    self.edit_image_label.setPixmap(pixmap)
-                    
-                    # Update stored image
-                    self.edit_image = cropped_img
+                box = crop_dialog.get_crop_box()
+                if box:
+                    # Map the selection back to full-resolution coordinates
+                    self.edit_stack.push({"op": "crop", "box": [round(v / scale) for v in box]})
+                    self.show_edit_preview()
                     
                     # Ask to save
-                    file_path, _ = QFileDialog.getSaveFileName(
-                        self,
-                        "Save Cropped Image",
-                        "",
-                        "PNG (*.png);;JPEG (*.jpg);;All files (*.*)"
-                    )
-                    
-                    # ...after saving...
-                    if file_path:
-                        msg = QMessageBox(self)
-                        msg.setWindowTitle("Success")
-                        msg.setText(f"Cropped image saved:\n{file_path}")
-                        msg.setIconPixmap(self.get_accent_icon("info").pixmap(48, 48))
-                        msg.exec()
+                    self.save_edit_image("Save Cropped Image")
         # ...on error...
         except Exception as e:
             msg = QMessageBox(self)
@@ -1389,61 +3883,33 @@ class Editara(QMainWindow):
             msg.exec()
             return
 
-        try:
-            # Show loading spinner
-            self.show_loading("Enhancing image quality...")
-            self.statusBar().showMessage("Enhancing image quality, please wait...")
-            # Convert PIL image to OpenCV (numpy) format
-            img = np.array(self.edit_image.convert("RGB"))
-            img = cv2.cvtColor(img, cv2.COLOR_RGB2BGR)
-
-            # Load LapSRN model
-            sr = cv2.dnn_superres.DnnSuperResImpl_create()
-            model_path = "LapSRN_x2.pb"
-            sr.readModel(model_path)
-            sr.setModel("lapsrn", 2)  # scale = 2
-
-            # Apply super resolution
-            result = sr.upsample(img)
-            self.hide_loading()  # Hide spinner after processing
-            # Update stored image
-            self.edit_image = Image.fromarray(result_rgb)
-            # Convert back to PIL for GUI usage
-            result_rgb = cv2.cvtColor(result, cv2.COLOR_BGR2RGB)
-            result_pil = Image.fromarray(result_rgb)
-
-            # Show preview
-            preview = result_pil.copy()
-            preview.thumbnail((300, 300))
-            qimage = self.pil_to_qimage(preview)
-            pixmap = QPixmap.fromImage(qimage)
-            self.edit_image_label.setPixmap(pixmap)
-
-            # Save file dialog
-            file_path, _ = QFileDialog.getSaveFileName(
-                self,
-                "Save Enhanced Image",
-                "",
-                "PNG (*.png);;JPEG (*.jpg);;All files (*.*)"
-            )
+        # Show loading spinner
+        self.show_loading("Enhancing image quality...")
+        self.statusBar().showMessage("Enhancing image quality, please wait...")
 
-            self.hide_loading()  # Hide spinner after processing
-            # ...after saving...
-            if file_path:
-                msg = QMessageBox(self)
-                msg.setWindowTitle("Success")
-                msg.setText(f"Enhanced image saved:\n{file_path}")
-                msg.setIconPixmap(self.get_accent_icon("info").pixmap(48, 48))
-                msg.exec()
+        # Apply super resolution to the proxy in a worker thread
+        self.quality_worker = Worker(self.edit_stack.push, ({"op": "upscale"},), report_progress=True)
+        self.quality_worker.progress.connect(self.update_loading)
+        self.quality_worker.finished.connect(self.improve_quality_done)
+        self.quality_worker.error.connect(self.improve_quality_error)
+        self.quality_worker.start()
 
-        # ...on error...
-        except Exception as e:
-            self.hide_loading()
-            msg = QMessageBox(self)
-            msg.setWindowTitle("Error")
-            msg.setText(f"Failed to enhance image:\n{str(e)}")
-            msg.setIconPixmap(self.get_accent_icon("error").pixmap(48, 48))
-            msg.exec()
+    def improve_quality_done(self, result_tuple):
+        self.hide_loading()  # Hide spinner after processing
+        self.show_edit_preview()
+        self.statusBar().showMessage("Image quality improved")
+
+        # Save file dialog
+        self.save_edit_image("Save Enhanced Image")
+
+    def improve_quality_error(self, error):
+        self.hide_loading()
+        self.statusBar().showMessage("Error enhancing image")
+        msg = QMessageBox(self)
+        msg.setWindowTitle("Error")
+        msg.setText(f"Failed to enhance image:\n{error}")
+        msg.setIconPixmap(self.get_accent_icon("error").pixmap(48, 48))
+        msg.exec()
             
 
     def get_downloads_folder(self):
@@ -1601,8 +4067,7 @@ class Editara(QMainWindow):
             # Try to add a thumbnail for images
             if self.file_types[i] == "image":
                 try:
-                    img = Image.open(file_path)
-                    img.thumbnail((80, 80))
+                    img = load_preview_image(file_path, (80, 80))
                     qimage = self.pil_to_qimage(img)
                     pixmap = QPixmap.fromImage(qimage)
                     thumb = QLabel()
@@ -1677,6 +4142,10 @@ class Editara(QMainWindow):
             self.format_combo.addItems(SUPPORTED_FORMATS)
             self.format_combo.setCurrentText("webp")
             self.quality_container.setVisible(True)  # Show the container instead of the layout
+            self.profile_container.setVisible(True)
+            self.target_container.setVisible(True)
+            self.batch_edit_container.setVisible(True)
+            self.dedup_checkbox.setVisible(True)
             self.time_crop_group.setVisible(False)
         else:  # Video
             self.image_button.setChecked(False)
@@ -1685,6 +4154,10 @@ class Editara(QMainWindow):
             self.format_combo.addItems(SUPPORTED_VIDEO_FORMATS)
             self.format_combo.setCurrentText("mp4")
             self.quality_container.setVisible(False)  # Hide the container instead of the layout
+            self.profile_container.setVisible(False)
+            self.target_container.setVisible(False)
+            self.batch_edit_container.setVisible(False)
+            self.dedup_checkbox.setVisible(False)
             self.time_crop_group.setVisible(True)
 
         # Clear selected files when mode changes
@@ -1795,6 +4268,9 @@ class Editara(QMainWindow):
         """
         self.file_path_input.setStyleSheet(input_style)
         self.format_combo.setStyleSheet(input_style)
+        self.profile_combo.setStyleSheet(input_style)
+        self.batch_edit_combo.setStyleSheet(input_style)
+        self.target_spin.setStyleSheet(input_style)
         self.width_input.setStyleSheet(input_style)
         self.height_input.setStyleSheet(input_style)
         
@@ -1895,8 +4371,8 @@ class Editara(QMainWindow):
                     "• Image Quality Adjustment: Set quality for image conversions.\n"
                     "• Video Time Cropping: Specify start and end times for video conversions.\n"
                     "• Image Editing Tools:\n"
-                    "  - Create passport size images (413x531 pixels).\n"
-                    "  - Remove background from images using GrabCut.\n"
+                    "  - Create passport size images (413x531 pixels) framed around the face.\n"
+                    "  - Remove background from images using a segmentation model (u2netp.onnx) or GrabCut.\n"
                     "  - Crop images with interactive selection.\n"
                     "  - Improve image quality using super-resolution (requires LapSRN_x2.pb model).\n"
                     "• Theme Toggle: Switch between dark and light themes.\n"
@@ -1918,7 +4394,7 @@ class Editara(QMainWindow):
                     "   a. Switch to the 'Image Edit' tab.\n"
                     "   b. Click 'Upload Image' to select an image.\n"
                     "   c. Use the tools:\n"
-                    "      - 'Passport Size': Resize to standard passport dimensions.\n"
+                    "      - 'Passport Size': Crop around the detected face and resize to standard passport dimensions.\n"
                     "      - 'Remove Background': Automatically remove the image background.\n"
                     "      - 'Crop Image': Select and crop a region interactively.\n"
                     "      - 'Improve Quality': Enhance resolution (model file required).\n"
@@ -1930,7 +4406,10 @@ class Editara(QMainWindow):
                     "• For support, contact the developer via the About section.\n\n"
                     "Requirements:\n"
                     "• Video conversion is built-in to the EXE version (no extra install needed).\n"
-                    "• Quality improvement requires the 'LapSRN_x2.pb' model file in the app directory."
+                    "• Quality improvement requires the 'LapSRN_x2.pb' model file in the app directory.\n"
+                    "• Other OpenCV super-resolution models (LapSRN x4/x8, FSRCNN, ESPCN) are used when their .pb files are in the app directory.\n"
+                    "• HEIC/HEIF decoding requires the 'pillow-heif' package (bundled in the EXE version).\n"
+                    "• Model-based background removal uses 'u2netp.onnx' in the app directory when present; otherwise GrabCut is used."
                 )
 
 
@@ -2076,25 +4555,116 @@ class Editara(QMainWindow):
         
         # Check resize settings
         resize_enabled = self.resize_group.isChecked()
-        
-        # Start conversion
-        self.is_converting = True
-        self.progress_bar.setValue(0)
-        self.convert_button.setEnabled(False)
-        self.statusBar().showMessage(f"Converting {self.mode.lower()}s...")
+
+        # Encoder profile and optional SSIM target for images
+        profile = self.profile_combo.currentText()
+        target_ssim = self.target_spin.value() if self.target_checkbox.isChecked() else None
+        operations = BATCH_EDIT_PRESETS[self.batch_edit_combo.currentText()]
+
+        # Offer to resume an interrupted job for the same files
+        if self.mode == "Image":
+            journal_path = find_resumable_job(self.selected_files, output_format)
+            if journal_path:
+                msg = QMessageBox(self)
+                msg.setWindowTitle("Resume Job")
+                msg.setText("An unfinished conversion of these files was found.\nResume where it stopped?")
+                msg.setIconPixmap(self.get_accent_icon("question").pixmap(48, 48))
+                msg.setStandardButtons(QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
+                if msg.exec() == QMessageBox.StandardButton.Yes:
+                    self.start_resume(journal_path)
+                    return
         
         # Start conversion in a worker thread
         if self.mode == "Image":
-            self.conversion_worker = Worker(
+            self.run_conversion_worker(
                 self.convert_images,
-                (self.selected_files, output_format, quality, resize_enabled)
+                (self.selected_files, output_format, quality, resize_enabled, profile, target_ssim, operations)
             )
         else:
-            self.conversion_worker = Worker(
+            self.run_conversion_worker(
                 self.convert_videos,
                 (self.selected_files, output_format, resize_enabled)
             )
-        
+
+    def toggle_watch_folder(self):
+        if self.watcher:
+            self.watcher.stop()
+            self.watcher = None
+            self.watch_button.setText("Watch Folder")
+            self.statusBar().showMessage("Stopped watching folder")
+            return
+
+        if self.mode != "Image":
+            msg = QMessageBox(self)
+            msg.setWindowTitle("Watch Folder")
+            msg.setText("Watch mode converts images. Switch to Image mode first.")
+            msg.setIconPixmap(self.get_accent_icon("warning").pixmap(48, 48))
+            msg.exec()
+            return
+
+        folder = QFileDialog.getExistingDirectory(self, "Select Folder to Watch")
+        if not folder:
+            return
+
+        resize = self.get_resize_settings() if self.resize_group.isChecked() else None
+        self.watch_signals = WatchSignals()
+        self.watch_signals.converted.connect(self.watch_file_converted)
+        self.watch_count = 0
+
+        self.watcher = HotFolderWatcher(
+            folder,
+            self.format_combo.currentText(),
+            self.quality_slider.value(),
+            resize,
+            self.profile_combo.currentText(),
+            on_converted=self.watch_signals.converted.emit
+        )
+        self.watcher.start()
+        self.output_folder = self.watcher.output_folder
+        self.watch_button.setText("Stop Watching")
+        self.statusBar().showMessage(f"Watching {folder} for new images...")
+
+    def watch_file_converted(self, file_path, target_path, seconds):
+        name = os.path.basename(file_path)
+        if target_path:
+            self.watch_count += 1
+            self.statusBar().showMessage(
+                f"Watching: converted {name} in {seconds * 1000:.0f} ms ({self.watch_count} total)"
+            )
+        else:
+            self.statusBar().showMessage(f"Watching: failed to convert {name}")
+
+    def closeEvent(self, event):
+        if self.watcher:
+            self.watcher.stop()
+            self.watcher = None
+        super().closeEvent(event)
+
+    def resume_job(self):
+        if self.is_converting:
+            return
+
+        file_path, _ = QFileDialog.getOpenFileName(
+            self,
+            "Select Job Journal",
+            "",
+            f"Editara job ({JOB_JOURNAL_NAME});;All files (*.*)"
+        )
+        if file_path:
+            self.start_resume(file_path)
+
+    def start_resume(self, journal_path):
+        self.run_conversion_worker(self.resume_images, (journal_path,))
+
+    def run_conversion_worker(self, function, args):
+        # Start conversion
+        self.is_converting = True
+        self.conversion_summary = None
+        self.progress_bar.setValue(0)
+        self.convert_button.setEnabled(False)
+        self.statusBar().showMessage(f"Converting {self.mode.lower()}s...")
+
+        self.conversion_worker = Worker(function, args)
         self.conversion_worker.progress.connect(self.update_progress)
         self.conversion_worker.finished.connect(self.conversion_complete)
         self.conversion_worker.error.connect(self.conversion_error)
@@ -2115,11 +4685,22 @@ class Editara(QMainWindow):
         self.progress_bar.setValue(100)
         self.statusBar().showMessage(f"Completed: {converted} converted, {skipped} skipped")
         
+        duplicates_text = ""
+        summary = self.conversion_summary
+        if summary and summary["duplicates"]:
+            duplicates_text = (
+                f"♻️ Duplicates: {summary['duplicates']} "
+                f"(saved {format_bytes(summary['bytes_saved'])}, ~{summary['time_saved']:.1f}s)\n"
+            )
+        if summary and summary["failed"]:
+            duplicates_text += f"❌ Failed: {summary['failed']} (see {BATCH_REPORT_NAME})\n"
+
         msg = QMessageBox(self)
         msg.setWindowTitle("Conversion Complete")
         msg.setText(
             f"✅ Converted: {converted}\n"
-            f"⏭️ Skipped: {skipped}\n\n"
+            f"⏭️ Skipped: {skipped}\n"
+            f"{duplicates_text}\n"
             f"Saved to: {self.output_folder}"
         )
         msg.setIconPixmap(self.get_accent_icon("info").pixmap(48, 48))
@@ -2136,86 +4717,43 @@ class Editara(QMainWindow):
         msg.setIconPixmap(self.get_accent_icon("error").pixmap(48, 48))
         msg.exec()
 
-    def convert_images(self, files, target_format, quality, resize_enabled):
-        target_ext = f".{target_format.lower()}"
-        
-        # Create output folder
-        if os.path.isdir(files[0]):
-            output_folder = os.path.join(files[0], f"Converted_to_{target_format}")
-        else:
-            output_folder = os.path.join(os.path.dirname(files[0]), f"Converted_to_{target_format}")
-        
-        os.makedirs(output_folder, exist_ok=True)
-        self.output_folder = output_folder
-        
-        converted = 0
-        skipped = 0
-        total_files = len(files)
-        
-        for idx, file_path in enumerate(files):
-            try:
-                # Update progress
-                progress = int(((idx + 0.5) / total_files) * 100)
-                self.conversion_worker.progress.emit(progress)
-                
-                # Skip if same format
-                filename = os.path.basename(file_path)
-                base_name, ext = os.path.splitext(filename)
-                if ext.lower() == target_ext:
-                    skipped += 1
-                    continue
-                
-                # Open and convert image
-                with Image.open(file_path) as img:
-                    # Apply resize if enabled
-                    if resize_enabled:
-                        original_w, original_h = img.size
-                        
-                        # Get new dimensions based on selected resize mode
-                        if self.resize_width_radio.isChecked():
-                            new_width = self.width_input.value()
-                            new_height = int(original_h * (new_width / original_w))
-                        elif self.resize_height_radio.isChecked():
-                            new_height = self.height_input.value()
-                            new_width = int(original_w * (new_height / original_h))
-                        else:  # Both width and height
-                            new_width = self.width_input.value()
-                            new_height = self.height_input.value()
-                        
-                        img = img.resize((new_width, new_height), Image.LANCZOS)
-                    
-                    # Handle mode conversion if needed
-                    if img.mode in ("RGBA", "P") and target_format.lower() in ['jpg', 'jpeg']:
-                        img = img.convert("RGB")
-                    
-                    # Save with appropriate quality settings
-                    target_path = os.path.join(output_folder, f"{base_name}{target_ext}")
-                    save_args = {}
-                    
-                    if target_format.lower() in ['jpg', 'jpeg', 'webp']:
-                        save_args['quality'] = quality
-                    elif target_format.lower() == 'png':
-                        # PNG uses compression level (0-9) instead of quality
-                        # Convert quality (10-100) to compression (9-0)
-                        compression = min(9, max(0, int(9 - (quality / 10))))
-                        save_args['compress_level'] = compression
-                    
-                    img.save(target_path, **save_args)
-                    converted += 1
-                    
-            except Exception as e:
-                print(f"Error converting {file_path}: {e}")
-                skipped += 1
-            
-            # Update progress
-            progress = int(((idx + 1) / total_files) * 100)
-            self.conversion_worker.progress.emit(progress)
-        
-        return converted, skipped
+    def get_resize_settings(self):
+        # Resize setting as ("width"|"height"|"both", width, height)
+        if self.resize_width_radio.isChecked():
+            mode = "width"
+        elif self.resize_height_radio.isChecked():
+            mode = "height"
+        else:  # Both width and height
+            mode = "both"
+        return mode, self.width_input.value(), self.height_input.value()
+
+    def convert_images(self, files, target_format, quality, resize_enabled,
+                       profile=DEFAULT_ENCODER_PROFILE, target_ssim=None, operations=None):
+        resize = self.get_resize_settings() if resize_enabled else None
+
+        # Edit tools are heavy; run them on a process pool
+        summary = convert_image_batch(
+            files, target_format, quality, resize, profile,
+            progress=self.conversion_worker.progress.emit,
+            dedup=self.dedup_checkbox.isChecked(),
+            target_ssim=target_ssim,
+            operations=operations,
+            workers=BATCH_WORKERS if operations else 1
+        )
+        self.output_folder = summary["output_folder"]
+        self.conversion_summary = summary
+        return summary["converted"], summary["skipped"]
+
+    def resume_images(self, journal_path):
+        summary = resume_image_job(journal_path, progress=self.conversion_worker.progress.emit)
+        self.output_folder = summary["output_folder"]
+        self.conversion_summary = summary
+        return summary["converted"], summary["skipped"]
 
     def convert_videos(self, files, target_format, resize_enabled):
         if not MOVIEPY_AVAILABLE:
             raise Exception("moviepy is not installed. Please run: pip install moviepy")
+        from moviepy import VideoFileClip
         
         target_ext = f".{target_format.lower()}"
         
@@ -2303,14 +4841,345 @@ class Editara(QMainWindow):
         
         return converted, skipped
 
+def build_arg_parser():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="editara",
+        description="Editara command line (runs without opening the window)"
+    )
+    parser.add_argument("--convert", nargs="+", metavar="PATH",
+                        help="Image files or folders to convert")
+    parser.add_argument("--format", default="webp", choices=SUPPORTED_FORMATS,
+                        help="Output format (default: webp)")
+    parser.add_argument("--quality", type=int, default=90,
+                        help="Quality for lossy formats, 10-100 (default: 90)")
+    parser.add_argument("--profile", default=DEFAULT_ENCODER_PROFILE, choices=ENCODER_PROFILE_NAMES,
+                        help=f"Encoder profile (default: {DEFAULT_ENCODER_PROFILE})")
+    parser.add_argument("--target-ssim", type=float, metavar="SCORE",
+                        help="Pick the lowest JPG/WEBP quality per image reaching this SSIM (e.g. 0.95)")
+    parser.add_argument("--pipeline", metavar="JSON",
+                        help='Edit operations to run on each image, as JSON or a .json file, '
+                             'e.g. \'[{"op": "crop", "box": [0, 0, 800, 600]}]\'')
+    parser.add_argument("--workers", type=int, default=1,
+                        help=f"Convert on a pool of this many processes (e.g. {BATCH_WORKERS} for edit pipelines)")
+    parser.add_argument("--no-dedup", action="store_true",
+                        help="Convert duplicate files separately instead of linking one output")
+    parser.add_argument("--width", type=int, help="Resize to this width")
+    parser.add_argument("--height", type=int, help="Resize to this height")
+    parser.add_argument("--watch", metavar="FOLDER",
+                        help="Convert images as they are dropped into FOLDER (Ctrl+C to stop)")
+    parser.add_argument("--serve", action="store_true",
+                        help="Run the local HTTP conversion service (Ctrl+C to stop)")
+    parser.add_argument("--host", default="127.0.0.1", help="Service host (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="Service port (default: 8765)")
+    parser.add_argument("--resume", metavar="JOURNAL",
+                        help=f"Resume an interrupted job from its {JOB_JOURNAL_NAME} (or its output folder)")
+    parser.add_argument("--benchmark-sr", nargs="+", metavar="FILE",
+                        help="Report ms/MP and PSNR for every available super-resolution model")
+    parser.add_argument("--mask-cache", metavar="FOLDER",
+                        help="Also keep background removal masks in FOLDER, so reruns reuse them")
+    parser.add_argument("--benchmark-encoders", nargs="+", metavar="FILE",
+                        help="Report encode ms/MP and bytes/MP for every encoder profile")
+    parser.add_argument("--benchmark-grabcut", nargs="+", metavar="FILE",
+                        help="Compare background removal methods (GrabCut full/fast, DNN if its model is present)")
+    parser.add_argument("--profile-startup", nargs="?", const="editara_startup.json", metavar="REPORT",
+                        help="Launch the window once (offscreen unless QT_QPA_PLATFORM is set), write import and "
+                             "startup timings to REPORT (default: editara_startup.json) and exit with 1 if "
+                             "time-to-interactive is over --startup-budget")
+    parser.add_argument("--startup-budget", type=float, metavar="MS",
+                        help=f"Time-to-interactive limit for --profile-startup (default: {STARTUP_BUDGET_MS})")
+    parser.add_argument("--check-update", action="store_true",
+                        help="Check for a newer release (uses the cached answer for an hour; "
+                             "EDITARA_UPDATE_URL overrides the release endpoint)")
+    return parser
+
+
+def collect_image_files(paths):
+    """ Expand folders into the supported image files they contain """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, names in os.walk(path):
+                for name in names:
+                    if os.path.splitext(name)[1].lower().lstrip('.') in SUPPORTED_FORMATS:
+                        files.append(os.path.join(root, name))
+        elif os.path.splitext(path)[1].lower().lstrip('.') in SUPPORTED_FORMATS:
+            files.append(path)
+    return files
+
+
+def print_summary(summary):
+    print(f"Converted: {summary['converted']}, Skipped: {summary['skipped']}")
+    if summary["duplicates"]:
+        print(f"Duplicates: {summary['duplicates']} "
+              f"(saved {format_bytes(summary['bytes_saved'])}, ~{summary['time_saved']:.1f}s)")
+    if summary["failed"]:
+        print(f"Failed: {summary['failed']} (details in {summary['report']})")
+    print(f"Saved to: {summary['output_folder']}")
+
+
+def is_cli_invocation(argv):
+    """ True when the first argument is one of build_arg_parser()'s options """
+    if not argv:
+        return False
+    option = argv[0].split("=", 1)[0]
+    return option in build_arg_parser()._option_string_actions
+
+
+def run_cli(argv):
+    args = build_arg_parser().parse_args(argv)
+    if args.mask_cache:
+        mask_cache.folder = args.mask_cache
+
+    if args.benchmark_encoders:
+        rows = benchmark_encoder_profiles(collect_image_files(args.benchmark_encoders), quality=args.quality)
+        print(f"{'format':<8}{'profile':<10}{'ms/MP':>10}{'bytes/MP':>14}")
+        for fmt, profile, ms_per_mp, bytes_per_mp in rows:
+            print(f"{fmt:<8}{profile:<10}{ms_per_mp:>10.1f}{bytes_per_mp:>14.0f}")
+        return 0
+
+    if args.benchmark_sr:
+        rows = benchmark_sr_models(collect_image_files(args.benchmark_sr))
+        print(f"{'model':<18}{'scale':>6}{'ms/MP':>10}{'PSNR dB':>10}")
+        for name, scale, ms_per_mp, psnr in rows:
+            print(f"{name:<18}{scale:>6}{ms_per_mp:>10.1f}{psnr:>10.2f}")
+        return 0
+
+    if args.benchmark_grabcut:
+        rows = benchmark_background_removal(collect_image_files(args.benchmark_grabcut))
+        print(f"{'file':<24}{'method':<14}{'ms':>10}{'MP':>8}{'IoU':>8}")
+        for name, method, ms, megapixels, iou in rows:
+            print(f"{name[:23]:<24}{method:<14}{ms:>10.0f}{megapixels:>8.1f}{iou:>8.3f}")
+        return 0
+
+    if args.check_update:
+        result, error = check_latest_release()
+        if error:
+            print(f"Update check failed: {error}")
+            return 1
+        if result["status"] == "no_update":
+            print("No releases found.")
+        elif version.parse(result["latest_version"]) > version.parse(__version__):
+            print(f"Update available: {result['latest_version']} (current {__version__})")
+        else:
+            print(f"Editara {__version__} is up to date (latest {result['latest_version']})")
+        return 0
+
+    if args.profile_startup:
+        report = profile_startup(args.profile_startup, args.startup_budget)
+        print(f"{'startup':<28}{'ms':>10}")
+        for name, ms in report["marks"].items():
+            print(f"{name:<28}{ms:>10.1f}")
+        for name, ms in report["phases"].items():
+            print(f"{'  Editara.' + name:<28}{ms:>10.1f}")
+        print(f"\n{'slowest imports':<28}{'ms':>10}")
+        for row in [row for row in report["imports"] if row["level"] == 0][:10]:
+            print(f"{row['module'][:27]:<28}{row['cumulative_ms']:>10.1f}")
+        status = "within" if report["passed"] else "OVER"
+        print(f"\nTime to interactive {report['time_to_interactive_ms']:.0f} ms, {status} "
+              f"the {report['budget_ms']:.0f} ms budget. Report: {args.profile_startup}")
+        return 0 if report["passed"] else 1
+
+    resize = None
+    if args.width and args.height:
+        resize = ("both", args.width, args.height)
+    elif args.width:
+        resize = ("width", args.width, None)
+    elif args.height:
+        resize = ("height", None, args.height)
+
+    if args.watch:
+        def report(file_path, target_path, seconds):
+            status = f"-> {target_path}" if target_path else "failed"
+            print(f"{file_path} {status} ({seconds * 1000:.0f} ms)", flush=True)
+
+        watcher = HotFolderWatcher(args.watch, args.format, args.quality, resize, args.profile,
+                                   on_converted=report)
+        watcher.start()
+        print(f"Watching {args.watch} (output: {watcher.output_folder}). Press Ctrl+C to stop.", flush=True)
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            watcher.stop()
+        return 0
+
+    if args.serve:
+        service = ConversionService(args.host, args.port, verbose=True)
+        print(f"Editara service listening on {service.url}. Press Ctrl+C to stop.", flush=True)
+        try:
+            service.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            service.server.server_close()
+            service.executor.shutdown(wait=False)
+        return 0
+
+    if args.resume:
+        journal_path = find_job_journal(args.resume)
+        if not journal_path:
+            print(f"No job journal found at {args.resume}")
+            return 1
+        print_summary(resume_image_job(journal_path))
+        return 0
+
+    if args.convert:
+        files = collect_image_files(args.convert)
+        if not files:
+            print("No valid image files found.")
+            return 1
+        summary = convert_image_batch(
+            files, args.format, args.quality, resize, args.profile,
+            dedup=not args.no_dedup, target_ssim=args.target_ssim,
+            operations=ImagePipeline.parse(args.pipeline).operations if args.pipeline else None,
+            workers=args.workers
+        )
+        print_summary(summary)
+        return 0
+
+    build_arg_parser().print_help()
+    return 1
+
+
 # Main application entry point
+class StartupProfile:
+    """
+    Timings of a GUI launch: marks are milliseconds since process start,
+    phases are durations of the Editara.__init__ steps.
+    """
+
+    def __init__(self):
+        self.marks = {}
+        self.phases = {}
+
+    def mark(self, name):
+        self.marks[name] = round((time.perf_counter() - STARTUP_TIME) * 1000, 1)
+        return self.marks[name]
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = round((time.perf_counter() - start) * 1000, 1)
+
+
+startup_profile = StartupProfile()
+
+
+def report_startup_time():
+    """
+    Log time-to-interactive, and warn when it is over STARTUP_BUDGET_MS.
+    With EDITARA_PROFILE_STARTUP set to a file, write the startup timings
+    there as JSON and quit (see profile_startup).
+    """
+    elapsed_ms = startup_profile.mark("interactive")
+    budget_ms = float(os.environ.get("EDITARA_STARTUP_BUDGET_MS", STARTUP_BUDGET_MS))
+    if elapsed_ms > budget_ms:
+        print(f"Startup took {elapsed_ms:.0f} ms, over the {budget_ms:.0f} ms budget", file=sys.stderr)
+
+    profile_path = os.environ.get("EDITARA_PROFILE_STARTUP")
+    if profile_path:
+        with open(profile_path, "w") as f:
+            json.dump({"marks": startup_profile.marks, "phases": startup_profile.phases}, f)
+        QApplication.instance().quit()
+    return elapsed_ms
+
+
+def parse_import_times(stderr):
+    """ Rows of (module, self ms, cumulative ms, nesting level) from python -X importtime output """
+    rows = []
+    for line in stderr.splitlines():
+        fields = line[len("import time:"):].split("|")
+        if not line.startswith("import time:") or len(fields) != 3 or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = fields
+        level = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((name.strip(), int(self_us) / 1000, int(cumulative_us) / 1000, level))
+    return rows
+
+
+def profile_startup(report_path=None, budget_ms=None, timeout=120):
+    """
+    Launch the GUI once in a fresh process (offscreen unless QT_QPA_PLATFORM
+    is set), let it quit once it is interactive and collect per-module import
+    times, Editara.__init__ phases and time to first paint. The report is
+    written to report_path as JSON. Returns the report; "passed" is False
+    when time-to-interactive is over budget_ms.
+    """
+    import subprocess
+    import tempfile
+
+    budget_ms = float(budget_ms or os.environ.get("EDITARA_STARTUP_BUDGET_MS", STARTUP_BUDGET_MS))
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    env.pop("EDITARA_STARTUP_BUDGET_MS", None)  # the child shouldn't warn; the report says it
+
+    # A frozen build can't take interpreter options, so it reports no import times
+    if getattr(sys, "frozen", False):
+        command = [sys.executable]
+    else:
+        command = [sys.executable, "-X", "importtime", os.path.abspath(__file__)]
+
+    fd, timings_path = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    try:
+        env["EDITARA_PROFILE_STARTUP"] = timings_path
+        start = time.perf_counter()
+        result = subprocess.run(command, env=env, capture_output=True, text=True, timeout=timeout)
+        wall_ms = (time.perf_counter() - start) * 1000
+        if result.returncode != 0 or not os.path.getsize(timings_path):
+            raise RuntimeError(f"Editara did not start (exit code {result.returncode}):\n{result.stderr[-2000:]}")
+        with open(timings_path) as f:
+            timings = json.load(f)
+    finally:
+        os.remove(timings_path)
+
+    imports = sorted(parse_import_times(result.stderr), key=lambda row: row[2], reverse=True)
+    time_to_interactive = timings["marks"]["interactive"]
+    report = {
+        "version": __version__,
+        "platform": env["QT_QPA_PLATFORM"],
+        "time_to_interactive_ms": time_to_interactive,
+        "process_wall_ms": round(wall_ms, 1),
+        "budget_ms": budget_ms,
+        "passed": time_to_interactive <= budget_ms,
+        "marks": timings["marks"],
+        "phases": timings["phases"],
+        "imports": [{"module": name, "self_ms": self_ms, "cumulative_ms": cumulative_ms, "level": level}
+                    for name, self_ms, cumulative_ms, level in imports],
+    }
+    if report_path:
+        with open(report_path, "w") as f:
+            json.dump(report, f, indent=2)
+    return report
+
+
 def main():
+    # Process pool workers of a frozen (PyInstaller) build start here
+    multiprocessing.freeze_support()
+
+    # Command line mode (no window); anything else, like a file from "Open
+    # with" or a Qt option such as -style, still opens the window
+    if is_cli_invocation(sys.argv[1:]):
+        sys.exit(run_cli(sys.argv[1:]))
+
+    startup_profile.mark("main")
+
     # Create the QApplication instance
     app = QApplication(sys.argv)
+    startup_profile.mark("qapplication")
 
     # --- Splash Screen with logo.png ---
+    # (not on headless platforms, where showing it blocks for a second
+    # waiting for the window to be exposed)
     logo_path = resource_path("logo.png")
-    if os.path.exists(logo_path):
+    if os.path.exists(logo_path) and app.platformName() not in ("offscreen", "minimal"):
         splash_pix = QPixmap(logo_path)
         if not splash_pix.isNull():
             splash = QSplashScreen(
@@ -2323,14 +5192,13 @@ def main():
     else:
         splash = None
 
-    # Delay for 2 seconds, then show main window
-    def show_main():
-        window = Editara()
-        window.show()
-        if splash:
-            splash.finish(window)
-
-    QTimer.singleShot(2000, show_main)  # 2000 ms = 2 seconds
+    # Show the main window as soon as it is built; its first paint
+    # schedules report_startup_time()
+    window = Editara()
+    startup_profile.mark("show")
+    window.show()
+    if splash:
+        splash.finish(window)
 
     sys.exit(app.exec())
 
@@ -0,0 +1,23 @@
+import os
+import sys
+
+import pytest
+
+pytest.importorskip("PyQt6.QtWidgets")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import main  # noqa: E402
+
+
+def test_cold_start_within_budget(monkeypatch, tmp_path):
+    """ A fresh offscreen launch must reach time-to-interactive within EDITARA_STARTUP_BUDGET_MS """
+    monkeypatch.setenv("QT_QPA_PLATFORM", "offscreen")
+    budget_ms = float(os.environ.get("EDITARA_STARTUP_BUDGET_MS", main.STARTUP_BUDGET_MS))
+
+    report = main.profile_startup(str(tmp_path / "startup.json"), budget_ms=budget_ms)
+
+    assert report["platform"] == "offscreen"
+    assert set(report["phases"]) == {"setup_menu", "create_ui", "apply_theme"}
+    assert report["passed"], (
+        f"Time to interactive {report['time_to_interactive_ms']:.0f} ms is over the {budget_ms:.0f} ms budget"
+    )